@@ -0,0 +1,3 @@
+# benchmark suite for uriel
+#
+# see benchsuite.py for the command line interface
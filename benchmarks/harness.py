@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import shutil
+import platform
+import statistics
+import tempfile
+import importlib.machinery
+import importlib.util
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .site_generator import SiteOptions
+from .site_generator import generate_site
+
+##############################################################################
+# FUNCTIONS                                                                  #
+##############################################################################
+
+def load_uriel(uriel_path):
+    """
+    Load the uriel script as a module, with logging turned off.
+
+    This is roughly equivalent to 'import uriel', except that the module
+    can be loaded from any path, so different releases can be compared.
+
+    """
+
+    loader = importlib.machinery.SourceFileLoader("uriel", uriel_path)
+    spec = importlib.util.spec_from_loader("uriel", loader)
+    uriel = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(uriel)
+
+    def log(s):
+        pass
+
+    uriel.log = log
+
+    return uriel
+
+def run_build(uriel_path, project_root, jobs=1, engine=None):
+    """
+    Build the project once, with --profile turned on, and return the
+    timings for each phase of the build as a dictionary.
+
+    This is meant to run in a fresh process for every build, so that
+    module state and peak memory usage don't carry over between builds.
+
+    """
+
+    uriel = load_uriel(uriel_path)
+
+    options = uriel.BuildOptions()
+    options.jobs = jobs
+    options.profile = True
+    if engine is not None:
+        options.engine = engine
+
+    # start from an empty public directory every time
+    public_dir = os.path.join(project_root, uriel.PUBLIC_ROOT)
+    if os.path.isdir(public_dir):
+        shutil.rmtree(public_dir)
+
+    start = time.perf_counter()
+
+    try:
+        sys.modules["uriel"] = uriel
+        uriel.build_project(project_root, options)
+
+    finally:
+        uriel.unload_modules()
+        if "uriel" in sys.modules:
+            del(sys.modules["uriel"])
+
+    wall = time.perf_counter() - start
+
+    phases = {}
+    for (name, phase_wall, user, system, rss, files) in \
+            uriel.build_profile.phases:
+
+        phases[name] = {
+            "wall": phase_wall,
+            "user": user,
+            "sys": system,
+            "peak_rss": rss,
+            "files": files,
+        }
+
+    return {
+        "wall": wall,
+        "phases": phases,
+        "pages": len(uriel.build_profile.render_times),
+    }
+
+def summarize(values):
+    """
+    Get the minimum, median and maximum of a list of numbers.
+
+    """
+
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+    }
+
+def run_benchmark(uriel_path,
+                  site_options,
+                  runs=3,
+                  jobs=1,
+                  work_dir=None,
+                  engine=None):
+
+    """
+    Generate a synthetic project from the given SiteOptions, and build it
+    the given number of times.
+
+    Every build runs in a freshly started process.
+
+    Returns a dictionary with the results of every run, and a summary of
+    the wall, user and sys times for each phase of the build.
+
+    """
+
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix=".uriel-benchmark-",
+                                     dir=work_dir) as tmp_dir:
+
+        project_root = os.path.join(tmp_dir, "project")
+        node_count = generate_site(project_root, site_options)
+
+        context = multiprocessing.get_context("spawn")
+        for run in range(runs):
+            with ProcessPoolExecutor(max_workers=1,
+                                     mp_context=context) as executor:
+
+                future = executor.submit(run_build,
+                                         os.path.abspath(uriel_path),
+                                         project_root,
+                                         jobs,
+                                         engine)
+                results.append(future.result())
+
+    summary = {"total": {"wall": summarize([r["wall"] for r in results])}}
+
+    for name in results[0]["phases"]:
+        summary[name] = {}
+        for key in ["wall", "user", "sys", "peak_rss"]:
+            summary[name][key] = \
+                summarize([r["phases"][name][key] for r in results])
+        summary[name]["files"] = results[0]["phases"][name]["files"]
+
+    return {
+        "site": dict(site_options.to_dict(), node_files=node_count),
+        "jobs": jobs,
+        "engine": engine,
+        "runs": results,
+        "summary": summary,
+    }
+
+def get_environment(uriel_path):
+    """
+    Get a description of the environment the benchmark ran in.
+
+    """
+
+    uriel = load_uriel(uriel_path)
+
+    return {
+        "uriel_version": uriel.VERSION,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import tracemalloc
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .harness import load_uriel
+from .site_generator import generate_site
+
+##############################################################################
+# FUNCTIONS                                                                  #
+##############################################################################
+
+def measure_memory(uriel_path, project_root):
+    """
+    Read the node tree of a project into memory, tokenize every node body,
+    and create a Page for every node, and return how much memory each of
+    them took as a dictionary.
+
+    Memory is measured with tracemalloc, so it only counts what Python
+    allocated, and nothing is ever freed until we are done measuring.
+
+    This is meant to run in a fresh process, like run_build().
+
+    """
+
+    uriel = load_uriel(uriel_path)
+
+    tracemalloc.start()
+
+    # nodes (including headers and bodies)
+    before = tracemalloc.get_traced_memory()[0]
+    root = uriel.create_file_node_tree(project_root)
+    nodes = [root]
+    for node in nodes:
+        nodes.extend(node.get_children())
+    node_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    # tokens (not including the lines they came from)
+    lines = []
+    for node in nodes:
+        lines.extend(node.get_body().split("\n"))
+
+    tokenize = uriel.tokenize_line
+    before = tracemalloc.get_traced_memory()[0]
+    tokens = []
+    for line in lines:
+        tokens.extend(tokenize(line))
+    token_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    # pages (before they are rendered)
+    before = tracemalloc.get_traced_memory()[0]
+    pages = [uriel.Page(project_root, node) for node in nodes]
+    page_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    tracemalloc.stop()
+
+    return {
+        "slots": "__slots__" in uriel.Node.__dict__,
+        "nodes": len(nodes),
+        "node_bytes": node_bytes,
+        "bytes_per_node": node_bytes / len(nodes),
+        "tokens": len(tokens),
+        "token_bytes": token_bytes,
+        "bytes_per_token": token_bytes / max(1, len(tokens)),
+        "pages": len(pages),
+        "page_bytes": page_bytes,
+        "bytes_per_page": page_bytes / len(pages),
+    }
+
+def run_memory_benchmark(uriel_path, site_options, work_dir=None):
+    """
+    Generate a synthetic project from the given SiteOptions, and measure
+    the memory used by its nodes, tokens and pages in a freshly started
+    process (see measure_memory()).
+
+    To see the savings from a change, run this against both versions of
+    the uriel script.
+
+    """
+
+    with tempfile.TemporaryDirectory(prefix=".uriel-benchmark-",
+                                     dir=work_dir) as tmp_dir:
+
+        project_root = os.path.join(tmp_dir, "project")
+        node_count = generate_site(project_root, site_options)
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1,
+                                 mp_context=context) as executor:
+
+            future = executor.submit(measure_memory,
+                                     os.path.abspath(uriel_path),
+                                     project_root)
+            result = future.result()
+
+    result["site"] = dict(site_options.to_dict(), node_files=node_count)
+
+    return result
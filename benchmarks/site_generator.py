@@ -0,0 +1,249 @@
+import os
+
+##############################################################################
+# CLASSES                                                                    #
+##############################################################################
+
+class SiteOptions:
+    """
+    Describes the shape of a synthetic project.
+
+    """
+
+    def __init__(self,
+                 nodes=1000,
+                 depth=2,
+                 fan_out=10,
+                 tags=100,
+                 tags_per_node=3,
+                 include_depth=2,
+                 soju_calls=1):
+
+        """
+        Accepts the total number of nodes, the depth of the node directory
+        tree, the number of subdirectories in each directory, the number of
+        distinct tags, the number of tags on each page, how deeply templates
+        include other templates, and the number of {{soju:*}} calls in the
+        default template.
+
+        """
+
+        self.nodes = nodes
+        self.depth = depth
+        self.fan_out = fan_out
+        self.tags = tags
+        self.tags_per_node = tags_per_node
+        self.include_depth = include_depth
+        self.soju_calls = soju_calls
+
+    def to_dict(self):
+        """
+        Get the options as a dictionary (e.g. for JSON output).
+
+        """
+
+        return {
+            "nodes": self.nodes,
+            "depth": self.depth,
+            "fan_out": self.fan_out,
+            "tags": self.tags,
+            "tags_per_node": self.tags_per_node,
+            "include_depth": self.include_depth,
+            "soju_calls": self.soju_calls,
+        }
+
+##############################################################################
+# FUNCTIONS                                                                  #
+##############################################################################
+
+def write_file(path, contents):
+    """
+    Write a text file, creating parent directories as needed.
+
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(contents)
+
+def get_directories(options):
+    """
+    Get the node directories (relative to nodes/) for the synthetic project,
+    breadth first, starting with the root directory ("").
+
+    Every directory needs an index node, so we stop adding directories
+    once there would be more directories than nodes.
+
+    """
+
+    directories = [""]
+    level = [""]
+
+    for depth in range(options.depth):
+        next_level = []
+        for parent in level:
+            for i in range(options.fan_out):
+                if len(directories) >= options.nodes - 1:
+                    return directories
+
+                directory = os.path.join(parent, "dir-%d" % (i))
+                directories.append(directory)
+                next_level.append(directory)
+
+        level = next_level
+
+    return directories
+
+def get_date(i):
+    """
+    Get a fixed Modified date for the i-th node, so that the same options
+    always produce the same project.
+
+    """
+
+    return "%04d-%02d-%02d" % (2000 + (i // 336), ((i // 28) % 12) + 1,
+                               (i % 28) + 1)
+
+def get_tags(options, i):
+    """
+    Get the Tags header value for the i-th node.
+
+    """
+
+    if options.tags < 1:
+        return None
+
+    count = min(options.tags_per_node, options.tags)
+    return ", ".join(["tag-%d" % ((i * 7 + j) % options.tags)
+                      for j in range(count)])
+
+def get_node_contents(options, i, title):
+    """
+    Get the contents of the i-th node file.
+
+    """
+
+    lines = ["Title: %s" % (title),
+             "Modified: %s" % (get_date(i))]
+
+    tags = get_tags(options, i)
+    if tags is not None:
+        lines.append("Tags: %s" % (tags))
+
+    lines.append("")
+    lines.append("<p>This is %s, node number %d.</p>" % (title, i))
+    lines.append("<p>It links back to {{node-link:index}}.</p>")
+    lines.append("")
+
+    return "\n".join(lines)
+
+def generate_templates(project_root, options):
+    """
+    Write the templates for the synthetic project.
+
+    The default template includes a chain of templates, options.include_depth
+    levels deep, and makes options.soju_calls calls into lib/soju.py.
+
+    """
+
+    templates_dir = os.path.join(project_root, "templates")
+
+    lines = ["<!DOCTYPE html>",
+             "<html>",
+             "<head>",
+             "<title>{{node:title}}</title>",
+             "<link rel=\"stylesheet\" href=\"{{static-hash-url:/style.css}}\">",
+             "</head>",
+             "<body>",
+             "{{breadcrumbs:*}}",
+             "<h1>{{node:title}}</h1>",
+             "<p>Modified {{modified:%B %d, %Y}}</p>",
+             "{{node:body}}"]
+
+    for i in range(options.soju_calls):
+        lines.append("<p>{{soju:bench_value(node, %d)}}</p>" % (i))
+
+    lines.append("{{node-list:*}}")
+
+    if options.include_depth > 0:
+        lines.append("{{include:include-1.html}}")
+
+    lines.append("</body>")
+    lines.append("</html>")
+    lines.append("")
+
+    write_file(os.path.join(templates_dir, "default.html"), "\n".join(lines))
+
+    # each included template includes the next one, down to the last one
+    for i in range(1, options.include_depth + 1):
+        lines = ["<div class=\"include-%d\">" % (i)]
+
+        if i < options.include_depth:
+            lines.append("{{include:include-%d.html}}" % (i + 1))
+        else:
+            lines.append("<p>{{node-title:index}}</p>")
+
+        lines.append("</div>")
+        lines.append("")
+
+        write_file(os.path.join(templates_dir, "include-%d.html" % (i)),
+                   "\n".join(lines))
+
+def generate_site(project_root, options):
+    """
+    Generate a synthetic project under the project root directory,
+    according to the given SiteOptions.
+
+    The project is always the same for the same options, so builds of it
+    can be compared between runs and between releases.
+
+    Returns the number of node files written.
+
+    """
+
+    nodes_dir = os.path.join(project_root, "nodes")
+
+    generate_templates(project_root, options)
+
+    write_file(os.path.join(project_root, "static/style.css"),
+               "body { font-family: sans-serif; }\n")
+
+    write_file(os.path.join(project_root, "lib/soju.py"),
+               "def bench_value(node, n):\n" + \
+               "    return \"%s-%d\" % (node.get_name(), n)\n")
+
+    # root node (with RSS and a sitemap index, so that large projects
+    # don't run out of sitemap capacity)
+    root = get_node_contents(options, 0, "Home").split("\n")
+    root[1:1] = ["Canonical-URL: https://example.com",
+                 "Tag-Node: tag",
+                 "RSS-URL: /rss.xml",
+                 "RSS-Title: Benchmark",
+                 "RSS-Description: Synthetic benchmark project",
+                 "Sitemap-URL: /sitemap.xml",
+                 "Sitemap-Index: true"]
+    write_file(os.path.join(nodes_dir, "index"), "\n".join(root))
+
+    # tag node
+    write_file(os.path.join(nodes_dir, "tag"),
+               get_node_contents(options, 1, "Tags"))
+
+    count = 2
+
+    # an index node for every directory
+    directories = get_directories(options)
+    for directory in directories[1:]:
+        write_file(os.path.join(nodes_dir, directory, "index"),
+                   get_node_contents(options, count, "Section %d" % (count)))
+        count += 1
+
+    # spread the rest of the nodes over the directories
+    i = 0
+    while count < options.nodes:
+        directory = directories[i % len(directories)]
+        write_file(os.path.join(nodes_dir, directory, "page-%d" % (count)),
+                   get_node_contents(options, count, "Page %d" % (count)))
+        count += 1
+        i += 1
+
+    return count
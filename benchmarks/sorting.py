@@ -0,0 +1,62 @@
+import time
+import datetime
+
+from .harness import load_uriel
+
+##############################################################################
+# FUNCTIONS                                                                  #
+##############################################################################
+
+def create_children(uriel, children):
+    """
+    Create a root VirtualNode with the given number of child nodes.
+
+    The children are created in no particular order, with a mix of dates,
+    so some of them have the same date and have to be sorted by title, and
+    some of them have the same title too, and have to be sorted by URL.
+
+    """
+
+    tz = datetime.timezone.utc
+    start = datetime.datetime(2020, 1, 1, tzinfo=tz)
+
+    root = uriel.VirtualNode("/nonexistent", "index")
+
+    for i in range(children):
+        # spread the children out, in a scrambled order
+        n = (i * 7919) % children
+
+        node = uriel.VirtualNode("/nonexistent", "page-%d" % (i), root)
+        node.created = start + datetime.timedelta(hours=n // 4)
+        node.modified = node.created
+        node.set_header("title", "Page %d" % (n // 2))
+        root.add_child(node)
+
+    return root
+
+def run_sort_benchmark(uriel_path, children, repeat=3):
+    """
+    Time sorting the child nodes of a node with get_children().
+
+    Every repetition starts with a freshly created tree, so nothing is
+    cached from a previous sort.
+
+    Returns a dictionary with the best time out of the given number of
+    repetitions.
+
+    """
+
+    uriel = load_uriel(uriel_path)
+
+    times = []
+    for i in range(repeat):
+        root = create_children(uriel, children)
+
+        start = time.perf_counter()
+        root.get_children()
+        times.append(time.perf_counter() - start)
+
+    return {
+        "children": children,
+        "seconds": min(times),
+    }
@@ -0,0 +1,67 @@
+import time
+
+from .harness import load_uriel
+
+##############################################################################
+# FUNCTIONS                                                                  #
+##############################################################################
+
+def make_line(length, spacing=64):
+    """
+    Make a line of (roughly) the given length, with a substitution parameter
+    every spacing characters, like a minified HTML body.
+
+    """
+
+    chunk = "<p>" + ("x" * (spacing - 20)) + "</p>{{value:foo}}"
+    count = max(1, length // len(chunk))
+
+    return chunk * count
+
+def get_tokenizer(uriel):
+    """
+    Get the tokenizer function from a loaded uriel module.
+
+    Older versions only have Page.tokenize(), which doesn't use the Page.
+
+    """
+
+    if hasattr(uriel, "tokenize_line"):
+        return uriel.tokenize_line
+
+    def tokenize(line):
+        return uriel.Page.tokenize(None, line)
+
+    return tokenize
+
+def run_tokenizer_benchmark(uriel_path, lengths, repeat=3):
+    """
+    Time the tokenizer on lines of growing length.
+
+    Returns a list of dictionaries, one for each line length, with the best
+    time out of the given number of repetitions.
+
+    """
+
+    tokenize = get_tokenizer(load_uriel(uriel_path))
+
+    results = []
+    for length in lengths:
+        line = make_line(length)
+
+        times = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            tokens = tokenize(line)
+            times.append(time.perf_counter() - start)
+
+        seconds = min(times)
+
+        results.append({
+            "length": len(line),
+            "tokens": len(tokens),
+            "seconds": seconds,
+            "mb_per_second": (len(line) / (1024 * 1024)) / seconds,
+        })
+
+    return results
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import argparse
+
+from benchmarks.harness import get_environment
+from benchmarks.harness import run_benchmark
+from benchmarks.memory import run_memory_benchmark
+from benchmarks.site_generator import SiteOptions
+from benchmarks.sorting import run_sort_benchmark
+from benchmarks.tokenizer import run_tokenizer_benchmark
+
+def get_node_counts(s):
+    """
+    Parse a comma separated list of node counts (e.g. "1000,10000,100000").
+
+    """
+
+    try:
+        counts = [int(count) for count in s.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid node counts: '%s'" % (s))
+
+    for count in counts:
+        if count < 2:
+            raise argparse.ArgumentTypeError("node counts must be at least 2")
+
+    return counts
+
+def get_lengths(s):
+    """
+    Parse a comma separated list of line lengths (e.g. "1000,1000000").
+
+    """
+
+    try:
+        lengths = [int(length) for length in s.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid line lengths: '%s'" % (s))
+
+    return lengths
+
+def main():
+    """
+    Generate synthetic projects, build each of them several times, and
+    write the timings for every phase of the build as JSON.
+
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark uriel builds of synthetic projects.")
+
+    parser.add_argument("--nodes", type=get_node_counts, default=[1000],
+                        help="comma separated node counts (default 1000)")
+    parser.add_argument("--depth", type=int, default=2,
+                        help="node directory depth (default 2)")
+    parser.add_argument("--fan-out", type=int, default=10,
+                        help="subdirectories per directory (default 10)")
+    parser.add_argument("--tags", type=int, default=100,
+                        help="number of distinct tags (default 100)")
+    parser.add_argument("--tags-per-node", type=int, default=3,
+                        help="tags on each node (default 3)")
+    parser.add_argument("--include-depth", type=int, default=2,
+                        help="template {{include:*}} depth (default 2)")
+    parser.add_argument("--soju-calls", type=int, default=1,
+                        help="{{soju:*}} calls per page (default 1)")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="builds per project (default 3)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="uriel --jobs value (default 1)")
+    parser.add_argument("--engine", default=None,
+                        help="uriel --engine value (default: uriel's default)")
+    parser.add_argument("--uriel", default="./uriel",
+                        help="path to the uriel script (default ./uriel)")
+    parser.add_argument("--tokenizer", action="store_true",
+                        help="only run the tokenizer micro-benchmark")
+    parser.add_argument("--sort", action="store_true",
+                        help="only run the child node sorting " +
+                             "micro-benchmark")
+    parser.add_argument("--children", type=int, default=100000,
+                        help="child nodes to sort for --sort (default 100000)")
+    parser.add_argument("--memory", action="store_true",
+                        help="measure the memory used by nodes, tokens and " +
+                             "pages instead of timing builds")
+    parser.add_argument("--lengths", type=get_lengths,
+                        default=[1000, 10000, 100000, 1000000],
+                        help="comma separated line lengths for --tokenizer")
+    parser.add_argument("--work-dir", default=None,
+                        help="directory to generate projects in")
+    parser.add_argument("--output", default=None,
+                        help="write JSON here instead of standard output")
+
+    args = parser.parse_args()
+
+    report = {
+        "environment": get_environment(args.uriel),
+        "benchmarks": [],
+    }
+
+    if args.tokenizer:
+        print("benchmarking the tokenizer", file=sys.stderr)
+        report["tokenizer"] = run_tokenizer_benchmark(args.uriel,
+                                                      args.lengths,
+                                                      args.runs)
+        args.nodes = []
+
+    if args.sort:
+        print("benchmarking sorting %d child nodes" % (args.children),
+              file=sys.stderr)
+        report["sort"] = run_sort_benchmark(args.uriel,
+                                            args.children,
+                                            args.runs)
+        args.nodes = []
+
+    for nodes in args.nodes:
+        site_options = SiteOptions(nodes=nodes,
+                                   depth=args.depth,
+                                   fan_out=args.fan_out,
+                                   tags=args.tags,
+                                   tags_per_node=args.tags_per_node,
+                                   include_depth=args.include_depth,
+                                   soju_calls=args.soju_calls)
+
+        if args.memory:
+            print("measuring memory for %d nodes" % (nodes), file=sys.stderr)
+            report["benchmarks"].append(run_memory_benchmark(args.uriel,
+                                                             site_options,
+                                                             args.work_dir))
+            continue
+
+        print("benchmarking %d nodes (%d runs)" % (nodes, args.runs),
+              file=sys.stderr)
+
+        report["benchmarks"].append(run_benchmark(args.uriel,
+                                                  site_options,
+                                                  args.runs,
+                                                  args.jobs,
+                                                  args.work_dir,
+                                                  args.engine))
+
+    output = json.dumps(report, indent=4, sort_keys=True) + "\n"
+
+    if args.output is None:
+        sys.stdout.write(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+if __name__ == "__main__":
+    main()
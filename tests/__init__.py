@@ -17,6 +17,17 @@ from .token import *
 from .template_stack import *
 from .page import *
 from .node import *
+from .node_headers import *
 from .file_writer import *
+from .page_writer import *
+from .node_file_reader import *
+from .source_file_cache import *
+from .template_cache import *
+from .fragment_cache import *
+from .render_engine import *
+from .preview_site import *
 from .uriel_functions import *
+from .build_cache import *
+from .build_profile import *
+from .site_generator import *
 
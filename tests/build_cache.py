@@ -0,0 +1,563 @@
+import os
+import re
+import sys
+import json
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+from .util import write_file
+from .util import build
+
+def build_in_container(project_root, incremental=True):
+    """
+    Build the project in a fresh UrielContainer, and return the container.
+
+    """
+
+    c = UrielContainer()
+    uriel = c.uriel
+
+    options = uriel.BuildOptions()
+    options.incremental = incremental
+
+    build(uriel, project_root, options)
+
+    return c
+
+def create_project(project_root):
+    """
+    Create a small project with a root node and two child nodes.
+
+    The child nodes have fixed modification dates, so that editing them
+    doesn't change the order of the links on the root node.
+
+    """
+
+    write_file(os.path.join(project_root, "templates/default.html"),
+               "<title>{{node:title}}</title>\n{{node:body}}\n")
+    write_file(os.path.join(project_root, "templates/other.html"),
+               "<h1>{{node:title}}</h1>\n{{node:body}}\n")
+    write_file(os.path.join(project_root, "nodes/index"),
+               "Title: Home\n\nhome\n")
+    write_file(os.path.join(project_root, "nodes/foo"),
+               "Title: Foo\nModified: 2024-01-02\n\nfoo\n")
+    write_file(os.path.join(project_root, "nodes/bar"),
+               "Title: Bar\nModified: 2024-01-01\nTemplate: other.html\n\nbar\n")
+    write_file(os.path.join(project_root, "static/style.css"),
+               "body { color: black; }\n")
+
+def get_unchanged_line(c):
+    """
+    Get the log line with the number of unchanged pages.
+
+    """
+
+    for line in c.stderr:
+        if line.endswith("unchanged since the previous build"):
+            return line
+
+    return None
+
+class TestClassBuildCache(unittest.TestCase):
+    """
+    Tests the BuildCache class.
+
+    """
+
+    def test_get_reverse_index(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            cache = uriel.BuildCache(project_root)
+            cache.pages = {
+                "index": {"templates": {"default.html": "a"},
+                          "nodes": {},
+                          "static": {}},
+                "foo": {"templates": {"default.html": "a",
+                                      "footer.html": "b"},
+                        "nodes": {"bar": "c"},
+                        "static": {"static/style.css": "d"}},
+            }
+
+            self.assertEqual(
+                {("templates", "default.html"): {"index", "foo"},
+                 ("templates", "footer.html"): {"foo"},
+                 ("nodes", "bar"): {"foo"},
+                 ("static", "static/style.css"): {"foo"}},
+                cache.get_reverse_index())
+            self.assertEqual(
+                {"foo"},
+                cache.get_dependent_pages("templates", "footer.html"))
+            self.assertEqual(
+                set(),
+                cache.get_dependent_pages("templates", "header.html"))
+
+    def test_get_file_hash(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            path = os.path.join(project_root, "foo")
+            write_file(path, "foo\n")
+
+            cache = uriel.BuildCache(project_root)
+            self.assertEqual("d3b07384d113edec49eaa6238ad5ff00",
+                             cache.get_file_hash(path))
+            self.assertEqual("", cache.get_file_hash(project_root))
+            self.assertIsNone(
+                cache.get_file_hash(os.path.join(project_root, "bar")))
+
+    def test_save_and_load(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            cache = uriel.BuildCache(project_root)
+            cache.add_generated_file(os.path.join(project_root, "public/rss.xml"))
+            cache.save()
+
+            manifest_file = os.path.join(project_root, ".uriel-cache/manifest.json")
+            self.assertTrue(os.path.isfile(manifest_file))
+
+            with open(manifest_file) as f:
+                manifest = json.load(f)
+            self.assertEqual(uriel.VERSION, manifest["version"])
+            self.assertEqual(["public/rss.xml"], manifest["generated"])
+
+            cache = uriel.BuildCache(project_root)
+            cache.load()
+            self.assertTrue(cache.was_generated(
+                os.path.join(project_root, "public/rss.xml")))
+            self.assertFalse(cache.was_generated(
+                os.path.join(project_root, "public/style.css")))
+
+    def test_load_unreadable_manifest(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            manifest_file = os.path.join(project_root, ".uriel-cache/manifest.json")
+            write_file(manifest_file, "{not json")
+
+            cache = uriel.BuildCache(project_root)
+            cache.load()
+
+            self.assertEqual(1, len(c.stderr))
+            self.assertTrue(c.stderr[0].startswith(
+                "ignoring unreadable build manifest"))
+            self.assertEqual({}, cache.previous_pages)
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    """
+    Tests incremental builds with handle_project().
+
+    """
+
+    def test_second_build_reuses_pages(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+
+            c = build_in_container(project_root)
+            self.assertEqual(0, c.exit_code)
+            self.assertEqual("0 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            foo = os.path.join(project_root, "public/foo/index.html")
+            mtime = os.stat(foo).st_mtime_ns
+
+            c = build_in_container(project_root)
+            self.assertEqual(0, c.exit_code)
+            self.assertEqual("3 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+            self.assertEqual(mtime, os.stat(foo).st_mtime_ns)
+
+            with open(foo) as f:
+                self.assertEqual("<title>Foo</title>\nfoo\n", f.read())
+
+    def test_unchanged_output_files_are_not_rewritten(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+
+            c = build_in_container(project_root)
+            self.assertIn("wrote 3 files, skipped 0 unchanged files",
+                          c.stderr)
+
+            foo = os.path.join(project_root, "public/foo/index.html")
+            os.utime(foo, ns=(0, 0))
+
+            # the node changed, but the page it renders to didn't
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nModified: 2024-01-02\nFoo: bar\n\nfoo\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("2 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+            self.assertIn("wrote 0 files, skipped 1 unchanged file",
+                          c.stderr)
+            self.assertEqual(0, os.stat(foo).st_mtime_ns)
+
+    def test_incremental_build_keeps_public_directory(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+
+            c = build_in_container(project_root)
+            self.assertIn(
+                "copying '" + project_root + "/static' to '" + \
+                project_root + "/public'",
+                c.stderr)
+            self.assertTrue(os.path.isfile(
+                os.path.join(project_root, "public/style.css")))
+            self.assertTrue(os.path.isfile(
+                os.path.join(project_root, "public/index.html")))
+
+    def test_node_change(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            build_in_container(project_root)
+
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nModified: 2024-01-02\n\nfoo changed\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("2 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            with open(os.path.join(project_root, "public/foo/index.html")) as f:
+                self.assertEqual("<title>Foo</title>\nfoo changed\n", f.read())
+
+    def test_template_change(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            build_in_container(project_root)
+
+            write_file(os.path.join(project_root, "templates/other.html"),
+                       "<h2>{{node:title}}</h2>\n{{node:body}}\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("2 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            with open(os.path.join(project_root, "public/bar/index.html")) as f:
+                self.assertEqual("<h2>Bar</h2>\nbar\n", f.read())
+
+    def test_included_template_change(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "templates/footer.html"),
+                       "footer\n")
+            write_file(os.path.join(project_root, "templates/other.html"),
+                       "<h1>{{node:title}}</h1>\n{{node:body}}\n" + \
+                       "{{include:footer.html}}\n")
+            build_in_container(project_root)
+
+            write_file(os.path.join(project_root, "templates/footer.html"),
+                       "new footer\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("2 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            with open(os.path.join(project_root, "public/bar/index.html")) as f:
+                self.assertEqual("<h1>Bar</h1>\nbar\nnew footer\n", f.read())
+
+    def test_referenced_node_change(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "nodes/bar"),
+                       "Title: Bar\nModified: 2024-01-01\n" + \
+                       "Template: other.html\n\nsee {{node-title:foo}}\n")
+            build_in_container(project_root)
+
+            # changing the body of the referenced node doesn't matter
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nModified: 2024-01-02\n\nfoo changed\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("2 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            # changing the title of the referenced node does
+            # (along with the root node, which links to it)
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Qux\nModified: 2024-01-02\n\nfoo changed\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("0 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            with open(os.path.join(project_root, "public/bar/index.html")) as f:
+                self.assertEqual("<h1>Bar</h1>\nsee Qux\n", f.read())
+
+    def test_modified_output_file(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            build_in_container(project_root)
+
+            foo = os.path.join(project_root, "public/foo/index.html")
+            write_file(foo, "tampered\n")
+
+            c = build_in_container(project_root)
+            self.assertEqual("2 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+            with open(foo) as f:
+                self.assertEqual("<title>Foo</title>\nfoo\n", f.read())
+
+    def test_user_defined_code_change(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "lib/soju.py"), "")
+            build_in_container(project_root)
+
+            write_file(os.path.join(project_root, "lib/soju.py"),
+                       "def foo():\n    return 'foo'\n")
+
+            c = build_in_container(project_root)
+            self.assertIn("user-defined code changed, rendering all pages",
+                          c.stderr)
+            self.assertEqual("0 pages unchanged since the previous build",
+                             get_unchanged_line(c))
+
+    def test_imported_lib_module_change(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "lib/soju.py"),
+                       "import words\n\ndef foo():\n    return words.foo\n")
+            write_file(os.path.join(project_root, "lib/words.py"),
+                       "foo = 'foo'\n")
+
+            try:
+                build_in_container(project_root)
+
+                # python bytecode written by the first build doesn't count
+                c = build_in_container(project_root)
+                self.assertEqual("3 pages unchanged since the previous build",
+                                 get_unchanged_line(c))
+
+                write_file(os.path.join(project_root, "lib/words.py"),
+                           "foo = 'bar'\n")
+
+                c = build_in_container(project_root)
+                self.assertIn("user-defined code changed, rendering all pages",
+                              c.stderr)
+                self.assertEqual("0 pages unchanged since the previous build",
+                                 get_unchanged_line(c))
+
+            finally:
+                # build() only unloads the soju and handlers modules
+                if "words" in sys.modules:
+                    del(sys.modules["words"])
+
+    def test_rebuild_in_memory(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            create_project(project_root)
+
+            options = uriel.BuildOptions()
+            options.incremental = True
+
+            uriel.source_file_cache = uriel.SourceFileCache()
+
+            try:
+                sys.modules["uriel"] = uriel
+
+                uriel.build_project(project_root, options)
+                self.assertEqual(0, len(uriel.build_cache.unchanged_pages))
+
+                write_file(os.path.join(project_root, "templates/other.html"),
+                           "<h2>{{node:title}}</h2>\n{{node:body}}\n")
+
+                # the manifest on disk is not used for the second build
+                os.unlink(os.path.join(project_root, ".uriel-cache/manifest.json"))
+
+                uriel.build_project(project_root, options)
+                self.assertEqual({"index", "foo"},
+                                 uriel.build_cache.unchanged_pages)
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+            with open(os.path.join(project_root, "public/bar/index.html")) as f:
+                self.assertEqual("<h2>Bar</h2>\nbar\n", f.read())
+
+    def test_rebuild_in_memory_after_failed_build(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "nodes/index"),
+                       "Title: Home\n" +
+                       "Canonical-URL: https://example.com\n" +
+                       "RSS-URL: /rss.xml\n" +
+                       "RSS-Description: example\n\nhome\n")
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nModified: 2024-01-02\n" +
+                       "RSS-Include: true\n\nfoo\n")
+
+            rss_file = os.path.join(project_root, "public/rss.xml")
+            bar_file = os.path.join(project_root, "public/bar/index.html")
+
+            options = uriel.BuildOptions()
+            options.incremental = True
+
+            uriel.source_file_cache = uriel.SourceFileCache()
+
+            try:
+                sys.modules["uriel"] = uriel
+
+                uriel.build_project(project_root, options)
+                self.assertTrue(os.path.isfile(rss_file))
+
+                # a template typo fails the build part of the way through
+                write_file(os.path.join(project_root, "templates/other.html"),
+                           "<h2>{{node:titel}}</h2>\n{{node:body}}\n")
+                self.assertRaises(uriel.UrielError,
+                                  uriel.build_project,
+                                  project_root,
+                                  options)
+
+                write_file(os.path.join(project_root, "templates/other.html"),
+                           "<h2>{{node:title}}</h2>\n{{node:body}}\n")
+
+                # the feed from the first build is still ours to overwrite,
+                # after every build
+                for i in range(2):
+                    c.stderr.clear()
+
+                    uriel.build_project(project_root, options)
+                    self.assertTrue(os.path.isfile(rss_file))
+                    for line in c.stderr:
+                        self.assertFalse(line.startswith("skipping creation"))
+
+                # and outputs that are no longer generated are still pruned
+                os.unlink(os.path.join(project_root, "nodes/bar"))
+                uriel.build_project(project_root, options)
+                self.assertFalse(os.path.exists(bar_file))
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+    def test_removed_node_output_is_deleted(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            build_in_container(project_root)
+
+            bar = os.path.join(project_root, "public/bar/index.html")
+            self.assertTrue(os.path.isfile(bar))
+
+            os.unlink(os.path.join(project_root, "nodes/bar"))
+
+            c = build_in_container(project_root)
+            self.assertIn("deleting '" + bar + "'", c.stderr)
+            self.assertFalse(os.path.exists(os.path.dirname(bar)))
+            self.assertTrue(os.path.isfile(
+                os.path.join(project_root, "public/foo/index.html")))
+
+    def test_static_files_are_not_deleted(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            build_in_container(project_root)
+
+            # a static file takes over the output path of a node,
+            # and then the node goes away
+            write_file(os.path.join(project_root, "static/bar/index.html"),
+                       "static bar\n")
+            os.unlink(os.path.join(project_root, "nodes/bar"))
+
+            c = build_in_container(project_root)
+            self.assertEqual([], [line for line in c.stderr
+                                  if line.startswith("deleting")])
+
+            with open(os.path.join(project_root, "public/bar/index.html")) as f:
+                self.assertEqual("static bar\n", f.read())
+
+    def test_old_static_hash_file_is_deleted(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "nodes/bar"),
+                       "Title: Bar\nModified: 2024-01-01\n" + \
+                       "Template: other.html\n\n" + \
+                       "{{static-hash-url:/style.css}}\n")
+            build_in_container(project_root)
+
+            with open(os.path.join(project_root, "public/bar/index.html")) as f:
+                hash_url = f.read().split("\n")[1]
+            old_hash_file = os.path.join(project_root, "public",
+                                         hash_url.lstrip("/"))
+            self.assertTrue(os.path.isfile(old_hash_file))
+
+            # an unrelated change keeps the hashed file around
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nModified: 2024-01-02\n\nfoo changed\n")
+
+            build_in_container(project_root)
+            self.assertTrue(os.path.isfile(old_hash_file))
+
+            # changing the static file replaces the hashed file
+            write_file(os.path.join(project_root, "static/style.css"),
+                       "body { color: white; }\n")
+
+            c = build_in_container(project_root)
+            self.assertIn("deleting '" + old_hash_file + "'", c.stderr)
+            self.assertFalse(os.path.exists(old_hash_file))
+            self.assertTrue(os.path.isfile(
+                os.path.join(project_root, "public/style.css")))
+
+    def test_format_text_rss(self):
+        def get_rss(project_root):
+            with open(os.path.join(project_root, "public/rss.xml")) as f:
+                rss = f.read()
+
+            # the build date is different every time
+            return re.sub(r"<lastBuildDate>.*</lastBuildDate>", "", rss)
+
+        with TempDir() as project_root:
+            create_project(project_root)
+            write_file(os.path.join(project_root, "nodes/index"),
+                       "Title: Home\n" +
+                       "Canonical-URL: https://example.com\n" +
+                       "RSS-URL: /rss.xml\n" +
+                       "RSS-Description: example\n\nhome\n")
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nModified: 2024-01-02\nFormat: text\n" +
+                       "RSS-Include: true\n\nfoo\nbar\n")
+
+            c = build_in_container(project_root, incremental=False)
+            self.assertEqual(0, c.exit_code)
+            full_rss = get_rss(project_root)
+            with open(os.path.join(project_root, "public/foo/index.html")) as f:
+                full_page = f.read()
+
+            self.assertIn("foo<br>\nbar", full_rss)
+
+            # the page is rendered, then reused, and reused again
+            for unchanged in (0, 3, 3):
+                c = build_in_container(project_root)
+                self.assertEqual(0, c.exit_code)
+                self.assertEqual(
+                    "%d pages unchanged since the previous build" %
+                    (unchanged),
+                    get_unchanged_line(c))
+
+                self.assertEqual(full_rss, get_rss(project_root))
+                with open(os.path.join(project_root,
+                                       "public/foo/index.html")) as f:
+                    self.assertEqual(full_page, f.read())
+
+    def test_full_build_does_not_use_cache(self):
+        with TempDir() as project_root:
+            create_project(project_root)
+
+            c = build_in_container(project_root, incremental=False)
+            self.assertEqual(0, c.exit_code)
+            self.assertIsNone(get_unchanged_line(c))
+            self.assertFalse(os.path.exists(
+                os.path.join(project_root, ".uriel-cache")))
@@ -0,0 +1,157 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+from .util import write_file
+from .util import build
+
+class TestBuildProfile(unittest.TestCase):
+    """
+    Tests the BuildProfile class.
+
+    """
+
+    def test_phase(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        profile = uriel.BuildProfile()
+        profile.start_phase("foo")
+        profile.add_file()
+        profile.add_file()
+        profile.end_phase()
+
+        self.assertEqual(1, len(profile.phases))
+
+        (name, wall, user, system, rss, files) = profile.phases[0]
+        self.assertEqual("foo", name)
+        self.assertTrue(wall >= 0.0)
+        self.assertTrue(user >= 0.0)
+        self.assertTrue(system >= 0.0)
+        self.assertTrue(rss > 0)
+        self.assertEqual(2, files)
+
+        # ending a phase that was never started does nothing
+        profile.end_phase()
+        self.assertEqual(1, len(profile.phases))
+
+    def test_log(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            profile = uriel.BuildProfile()
+            profile.phases = [("foo", 1.5, 1.0, 0.25, 10 * 1024 * 1024, 3),
+                              ("barbaz", 0.5, 0.5, 0.0, 20 * 1024 * 1024, 1)]
+
+            for (i, seconds) in enumerate([0.1, 0.3, 0.2]):
+                node = uriel.VirtualNode(project_root, "page-%d" % (i))
+                profile.add_render_time(node, seconds)
+
+            profile.log(slowest=2)
+
+            self.assertEqual([
+                "build profile:",
+                "-------+----------+----------+----------+----------+-------",
+                "phase  |     wall |     user |      sys | peak rss |  files",
+                "-------+----------+----------+----------+----------+-------",
+                "foo    |   1.500s |   1.000s |   0.250s |  10.0 MB |      3",
+                "barbaz |   0.500s |   0.500s |   0.000s |  20.0 MB |      1",
+                "-------+----------+----------+----------+----------+-------",
+                "total  |   2.000s |   1.500s |   0.250s |  20.0 MB |      4",
+                "-------+----------+----------+----------+----------+-------",
+                "slowest pages to render:",
+                "  0.300s | page-1 (default.html)",
+                "  0.200s | page-2 (default.html)",
+            ], c.stderr)
+
+    def test_add_token_time(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        profile = uriel.BuildProfile()
+        profile.add_token_time(uriel.Token("foo"), 0.5)
+        profile.add_token_time(uriel.Token("{{include:foo.html}}"), 1.0)
+        profile.add_token_time(uriel.Token("{{include:foo.html}}"), 2.0)
+        profile.add_token_time(uriel.Token("{{soju:foo(node)}}"), 0.25)
+
+        self.assertEqual({"literal": [1, 0.5],
+                          "include": [2, 3.0],
+                          "soju": [1, 0.25]},
+                         profile.token_times)
+        self.assertEqual({"include:foo.html": [2, 3.0],
+                          "soju:foo(node)": [1, 0.25]},
+                         profile.expression_times)
+
+        # merge in times from somewhere else (e.g. a worker process)
+        profile.add_token_times({"literal": [2, 0.5]},
+                                {"soju:bar(node)": [1, 0.125]})
+        self.assertEqual([3, 1.0], profile.token_times["literal"])
+        self.assertEqual([1, 0.125], profile.expression_times["soju:bar(node)"])
+
+    def test_log_token_times(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        profile = uriel.BuildProfile()
+        profile.log_token_times("token render times:",
+                                "token",
+                                {"literal": [4, 0.002],
+                                 "include": [2, 0.5]})
+
+        self.assertEqual([
+            "token render times:",
+            "--------+----------+------------+-----------",
+            "token   |    calls |      total |       mean",
+            "--------+----------+------------+-----------",
+            "include |        2 |     0.500s |  250.000ms",
+            "literal |        4 |     0.002s |    0.500ms",
+            "--------+----------+------------+-----------",
+        ], c.stderr)
+
+    def test_handle_project_profile(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            write_file(os.path.join(project_root, "templates/default.html"),
+                       "<title>{{node:title}}</title>\n{{node:body}}\n")
+            write_file(os.path.join(project_root, "templates/other.html"),
+                       "<h1>{{node:title}}</h1>\n{{node:body}}\n")
+            write_file(os.path.join(project_root, "nodes/index"),
+                       "Title: Home\n\nhome\n")
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\nTemplate: other.html\n\nfoo\n")
+
+            options = uriel.BuildOptions()
+            options.profile = True
+
+            build(uriel, project_root, options)
+
+            self.assertEqual(0, c.exit_code)
+            self.assertIn("build profile:", c.stderr)
+
+            phases = [phase[0] for phase in uriel.build_profile.phases]
+            self.assertEqual(["create_file_node_tree",
+                              "augment_node_tree",
+                              "render_node_tree",
+                              "write_dynamic_nodes",
+                              "write_additional_files",
+                              "prune_generated_files",
+                              "copy_static_files"],
+                             phases)
+
+            # 2 node files read, 2 page files written
+            files = dict([(phase[0], phase[5])
+                          for phase in uriel.build_profile.phases])
+            self.assertEqual(2, files["create_file_node_tree"])
+            self.assertEqual(2, files["write_dynamic_nodes"])
+
+            # {{node:title}} and {{node:body}} on each of the 2 pages
+            self.assertEqual(4, uriel.build_profile.token_times["node"][0])
+
+            paths = sorted([t[1:] for t in uriel.build_profile.render_times])
+            self.assertEqual([("foo", "other.html"),
+                              ("index", "default.html")],
+                             paths)
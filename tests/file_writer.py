@@ -1,4 +1,5 @@
 import os
+import gzip
 import unittest
 
 from .util import UrielContainer
@@ -58,3 +59,89 @@ class TestFileWriter(unittest.TestCase):
                 data = f.read()
             self.assertEqual(bytes([0x00, 0xFF]), data)
 
+
+    def test_write_if_changed(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            uriel.write_stats = uriel.WriteStats()
+
+            file_path = os.path.join(tmp_dir, "test")
+            file_writer = uriel.FileWriter(file_path, write_if_changed=True)
+            file_writer.write("foo\n")
+
+            # nothing is written until the file is closed
+            self.assertFalse(os.path.exists(file_path))
+            file_writer.close()
+
+            with open(file_path, "r") as f:
+                self.assertEqual("foo\n", f.read())
+
+            # same content: the file is left alone
+            os.utime(file_path, ns=(0, 0))
+            file_writer = uriel.FileWriter(file_path, write_if_changed=True)
+            file_writer.write("foo\n")
+            file_writer.close()
+            self.assertEqual(0, os.stat(file_path).st_mtime_ns)
+
+            # same size, different content: the file is rewritten
+            file_writer = uriel.FileWriter(file_path, write_if_changed=True)
+            file_writer.write("bar\n")
+            file_writer.close()
+
+            with open(file_path, "r") as f:
+                self.assertEqual("bar\n", f.read())
+
+            self.assertEqual(2, uriel.write_stats.written)
+            self.assertEqual(1, uriel.write_stats.skipped)
+
+    def test_write_if_changed_missing_directory(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "does-not-exist/test")
+            file_writer = uriel.FileWriter(file_path, write_if_changed=True)
+            file_writer.write("foo\n")
+
+            self.assertRaises(uriel.UrielError, file_writer.close)
+
+
+class TestGzipFileWriter(unittest.TestCase):
+    """
+    Tests the GzipFileWriter class.
+
+    """
+
+    def test_write_if_changed(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            uriel.write_stats = uriel.WriteStats()
+
+            file_path = os.path.join(tmp_dir, "test.gz")
+            file_writer = uriel.GzipFileWriter(file_path, write_if_changed=True)
+            file_writer.write("foo\n")
+            file_writer.close()
+
+            with gzip.open(file_path, "rt") as f:
+                self.assertEqual("foo\n", f.read())
+
+            # same uncompressed content: the file is left alone
+            os.utime(file_path, ns=(0, 0))
+            file_writer = uriel.GzipFileWriter(file_path, write_if_changed=True)
+            file_writer.write("foo\n")
+            file_writer.close()
+            self.assertEqual(0, os.stat(file_path).st_mtime_ns)
+
+            file_writer = uriel.GzipFileWriter(file_path, write_if_changed=True)
+            file_writer.write("foo bar\n")
+            file_writer.close()
+
+            with gzip.open(file_path, "rt") as f:
+                self.assertEqual("foo bar\n", f.read())
+
+            self.assertEqual(2, uriel.write_stats.written)
+            self.assertEqual(1, uriel.write_stats.skipped)
@@ -0,0 +1,151 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+from .util import write_file
+
+def write_templates(project_root, templates):
+    """
+    Write templates into the project templates directory.
+
+    """
+
+    for (name, contents) in templates.items():
+        write_file(os.path.join(project_root, "templates", name), contents)
+
+class TestFragmentCache(unittest.TestCase):
+    """
+    Tests the FragmentCache class.
+
+    """
+
+    def test_get_headers(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            write_templates(project_root, {
+                "header.html": "<title>{{value:site-title}}</title>\n" +
+                               "{{include:nav.html}}\n",
+                "nav.html": "<a href=\"{{static-url:/}}\">" +
+                            "{{value-unescaped:author}}</a>\n",
+                "title.html": "<h1>{{node:title}}</h1>\n",
+                "relative.html": "{{static-url:style.css}}\n",
+                "unknown.html": "{{foo:bar}}\n",
+                "outer.html": "{{include:title.html}}\n",
+                "loop.html": "{{include:loop.html}}\n",
+            })
+
+            templates_dir = os.path.join(project_root, "templates")
+            cache = uriel.FragmentCache()
+
+            self.assertEqual(["author", "site-title"],
+                             cache.get_headers(templates_dir, "header.html"))
+            self.assertEqual(["author"],
+                             cache.get_headers(templates_dir, "nav.html"))
+
+            for template in ["title.html",
+                             "relative.html",
+                             "unknown.html",
+                             "outer.html",
+                             "loop.html",
+                             "missing.html"]:
+                self.assertIsNone(cache.get_headers(templates_dir, template),
+                                  template)
+
+    def test_include_cached(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            write_templates(project_root, {
+                "default.html": "{{include:header.html}}\n{{node:body}}\n",
+                "header.html": "<title>{{value:site-title}}</title>\n",
+            })
+
+            root = uriel.VirtualNode(project_root, "index")
+            root.set_header("site-title", "Foo")
+            root.set_body("index\n")
+
+            child = uriel.VirtualNode(project_root, "bar")
+            child.set_header("site-title", "Foo")
+            child.set_body("bar\n")
+
+            pages = [uriel.Page(project_root, node) for node in [root, child]]
+            self.assertEqual("<title>Foo</title>\nindex\n",
+                             pages[0].render())
+            self.assertEqual(1, len(uriel.fragment_cache.fragments))
+
+            # the include is rendered once, and reused for the second page
+            self.assertEqual("<title>Foo</title>\nbar\n",
+                             pages[1].render())
+            self.assertEqual(1, len(uriel.fragment_cache.fragments))
+
+            # the included template is still recorded as a dependency
+            for page in pages:
+                self.assertEqual({"default.html", "header.html"},
+                                 page.dependencies.templates)
+
+    def test_include_header_values(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            write_templates(project_root, {
+                "default.html": "{{include:header.html}}\n",
+                "header.html": "<title>{{value:site-title}}</title>\n",
+            })
+
+            results = []
+            for title in ["Foo", "Bar", "Foo"]:
+                node = uriel.VirtualNode(project_root, "index")
+                node.set_header("site-title", title)
+                results.append(uriel.Page(project_root, node).render())
+
+            # different header values are cached separately
+            self.assertEqual(["<title>Foo</title>\n",
+                              "<title>Bar</title>\n",
+                              "<title>Foo</title>\n"],
+                             results)
+            self.assertEqual(2, len(uriel.fragment_cache.fragments))
+
+    def test_include_node_dependent(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            write_templates(project_root, {
+                "default.html": "{{include:title.html}}\n",
+                "title.html": "<h1>{{node:title}}</h1>\n",
+            })
+
+            results = []
+            for title in ["Foo", "Bar"]:
+                node = uriel.VirtualNode(project_root, "index")
+                node.set_header("title", title)
+                results.append(uriel.Page(project_root, node).render())
+
+            self.assertEqual(["<h1>Foo</h1>\n", "<h1>Bar</h1>\n"], results)
+            self.assertEqual({}, uriel.fragment_cache.fragments)
+
+    def test_max_variants(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            write_templates(project_root, {
+                "default.html": "{{include:header.html}}\n",
+                "header.html": "<title>{{value:site-title}}</title>\n",
+            })
+
+            for i in range(uriel.FRAGMENT_CACHE_MAX_VARIANTS + 2):
+                node = uriel.VirtualNode(project_root, "index")
+                node.set_header("site-title", "page-%d" % (i))
+                self.assertEqual("<title>page-%d</title>\n" % (i),
+                                 uriel.Page(project_root, node).render())
+
+            # too many variants, so the template is no longer cached
+            self.assertEqual(uriel.FRAGMENT_CACHE_MAX_VARIANTS,
+                             len(uriel.fragment_cache.fragments))
+            self.assertIsNone(uriel.fragment_cache.headers["header.html"])
@@ -29,6 +29,24 @@ class TestNode(unittest.TestCase):
 
             self.assertRaises(Exception, node.get_node_type)
 
+    def test_meta(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            child = uriel.VirtualNode(project_root, "foo", root)
+
+            # nodes don't take arbitrary attributes, but they have meta
+            with self.assertRaises(AttributeError):
+                root.word_count = 42
+
+            root.meta["word-count"] = 42
+            self.assertEqual({"word-count": 42}, root.meta)
+
+            # meta is not inherited
+            self.assertEqual({}, child.meta)
+
     def test_basic_constructor(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -1069,6 +1087,160 @@ class TestNode(unittest.TestCase):
             self.assertEqual(expected_articles_file, articles.get_dest_file())
             self.assertEqual(expected_article_dog_file, article_dog.get_dest_file())
 
+    def test_get_sort_key(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        tz = datetime.timezone.utc
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+
+            older = uriel.VirtualNode(project_root, "older", root)
+            older.created = datetime.datetime(2020, 1, 1, tzinfo=tz)
+
+            b = uriel.VirtualNode(project_root, "b", root)
+            b.created = datetime.datetime(2021, 1, 1, tzinfo=tz)
+            b.set_header("title", "B")
+
+            a = uriel.VirtualNode(project_root, "a", root)
+            a.created = datetime.datetime(2021, 1, 1, tzinfo=tz)
+            a.set_header("title", "B")
+
+            c_node = uriel.VirtualNode(project_root, "c", root)
+            c_node.created = datetime.datetime(2021, 1, 1, tzinfo=tz)
+            c_node.set_header("title", "A")
+
+            self.assertEqual((-b.created.timestamp(), "B", "/b/"),
+                             b.get_sort_key())
+
+            # newest first, then by title, then by URL
+            nodes = sorted([older, b, a, c_node], key=uriel.Node.get_sort_key)
+            self.assertEqual([c_node, a, b, older], nodes)
+
+            # __lt__ agrees with the sort key
+            self.assertEqual(nodes, sorted([older, b, a, c_node]))
+
+    def test_get_sort_key_invalidated(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        tz = datetime.timezone.utc
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            parent = uriel.VirtualNode(project_root, "foo/index", root)
+            foo = uriel.VirtualNode(project_root, "foo/bar", parent)
+            foo.created = datetime.datetime(2021, 1, 1, tzinfo=tz)
+
+            key = foo.get_sort_key()
+            self.assertIs(key, foo.get_sort_key())
+            self.assertEqual("/foo/bar/", key[2])
+
+            # title
+            foo.set_header("title", "Foo")
+            self.assertEqual("Foo", foo.get_sort_key()[1])
+
+            # URL
+            foo.set_header("flat-url", "true")
+            self.assertEqual("/bar/", foo.get_sort_key()[2])
+
+            # dates
+            foo.created = datetime.datetime(2022, 1, 1, tzinfo=tz)
+            self.assertEqual(-foo.created.timestamp(), foo.get_sort_key()[0])
+
+            foo.created = None
+            foo.modified = datetime.datetime(2023, 1, 1, tzinfo=tz)
+            self.assertEqual(-foo.modified.timestamp(), foo.get_sort_key()[0])
+
+    def test_get_sort_key_mixed_time_zones(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+
+            # user-defined code can set a date without a time zone,
+            # which is taken to be in the local time zone
+            naive = uriel.VirtualNode(project_root, "naive", root)
+            naive.created = datetime.datetime(2021, 1, 1, 12, 0)
+
+            local = naive.created.astimezone()
+            self.assertEqual(-local.timestamp(), naive.get_sort_key()[0])
+
+            # a minute later, in the local time zone
+            later = uriel.VirtualNode(project_root, "later", root)
+            later.created = local + datetime.timedelta(minutes=1)
+
+            # a minute earlier, in a time zone far from the local one
+            # (so its clock time is hours off from the local clock time)
+            earlier = uriel.VirtualNode(project_root, "earlier", root)
+            earlier.created = (local - datetime.timedelta(minutes=1)) \
+                .astimezone(datetime.timezone(datetime.timedelta(hours=14)))
+
+            # dates are compared as points in time, whatever their time zones
+            nodes = sorted([earlier, naive, later], key=uriel.Node.get_sort_key)
+            self.assertEqual([later, naive, earlier], nodes)
+            self.assertEqual(nodes, sorted([earlier, naive, later]))
+
+    def test_get_date_range(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        tz = datetime.timezone.utc
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            root.created = datetime.datetime(2020, 1, 1, tzinfo=tz)
+            root.modified = datetime.datetime(2020, 6, 1, tzinfo=tz)
+
+            parent = uriel.VirtualNode(project_root, "foo/index", root)
+            parent.created = datetime.datetime(2021, 1, 1, tzinfo=tz)
+            parent.modified = None
+            root.add_child(parent)
+
+            foo = uriel.VirtualNode(project_root, "foo/bar", parent)
+            foo.created = datetime.datetime(2019, 1, 1, tzinfo=tz)
+            foo.modified = datetime.datetime(2022, 1, 1, tzinfo=tz)
+            parent.add_child(foo)
+
+            root.update_date_range()
+
+            self.assertEqual((datetime.datetime(2019, 1, 1, tzinfo=tz),
+                              datetime.datetime(2022, 1, 1, tzinfo=tz)),
+                             root.get_date_range())
+            self.assertEqual((datetime.datetime(2019, 1, 1, tzinfo=tz),
+                              datetime.datetime(2022, 1, 1, tzinfo=tz)),
+                             parent.get_date_range())
+            self.assertEqual((datetime.datetime(2019, 1, 1, tzinfo=tz),
+                              datetime.datetime(2022, 1, 1, tzinfo=tz)),
+                             foo.get_date_range())
+
+            # adding a child node invalidates the ranges above it
+            baz = uriel.VirtualNode(project_root, "foo/baz", parent)
+            baz.created = datetime.datetime(2018, 1, 1, tzinfo=tz)
+            baz.modified = datetime.datetime(2023, 1, 1, tzinfo=tz)
+            parent.add_child(baz)
+
+            self.assertIsNone(root.date_range_cache)
+            self.assertIsNone(parent.date_range_cache)
+            self.assertIsNotNone(foo.date_range_cache)
+
+            self.assertEqual((datetime.datetime(2018, 1, 1, tzinfo=tz),
+                              datetime.datetime(2023, 1, 1, tzinfo=tz)),
+                             root.get_date_range())
+
+    def test_get_date_range_no_dates(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            root.created = None
+            root.modified = None
+
+            self.assertEqual((None, None), root.get_date_range())
+
     def test_get_boolean_header_value_true_default_true(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -1191,6 +1363,72 @@ class TestNode(unittest.TestCase):
 
             self.assertEqual(" / ", root.get_breadcrumb_separator())
 
+    def test_get_breadcrumbs(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            root.set_header("canonical-url", "https://example.com")
+
+            foo = uriel.VirtualNode(project_root, "foo/index", root)
+            root.add_child(foo)
+
+            bar = uriel.VirtualNode(project_root, "foo/bar", foo)
+            foo.add_child(bar)
+
+            self.assertEqual("", root.get_breadcrumbs(False, False, " / "))
+            self.assertEqual(
+                "<a href=\"/\">Index</a> / " +
+                "<a href=\"/foo/\">Foo</a> / " +
+                "<a href=\"/foo/bar/\">Bar</a>",
+                bar.get_breadcrumbs(False, True, " / "))
+            self.assertEqual(
+                "<a href=\"https://example.com/foo/\">Foo</a> | " +
+                "<a href=\"https://example.com/foo/bar/\">Bar</a>",
+                bar.get_breadcrumbs(True, False, " | "))
+
+            # each combination is cached separately, on every ancestor
+            self.assertEqual(2, len(bar.breadcrumbs_cache))
+            self.assertEqual(2, len(foo.breadcrumbs_cache))
+            self.assertEqual(3, len(root.breadcrumbs_cache))
+            self.assertIs(bar.get_breadcrumbs(False, True, " / "),
+                          bar.get_breadcrumbs(False, True, " / "))
+
+    def test_get_breadcrumbs_invalidated(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+
+            foo = uriel.VirtualNode(project_root, "foo/index", root)
+            root.add_child(foo)
+
+            bar = uriel.VirtualNode(project_root, "foo/bar", foo)
+            foo.add_child(bar)
+
+            self.assertEqual(
+                "<a href=\"/foo/\">Foo</a> / <a href=\"/foo/bar/\">Bar</a>",
+                bar.get_breadcrumbs(False, False, " / "))
+
+            # changing the title of an ancestor changes the breadcrumbs
+            # of every node below it
+            foo.set_header("title", "Food")
+            self.assertIsNone(foo.breadcrumbs_cache)
+            self.assertIsNone(bar.breadcrumbs_cache)
+            self.assertEqual(
+                "<a href=\"/foo/\">Food</a> / <a href=\"/foo/bar/\">Bar</a>",
+                bar.get_breadcrumbs(False, False, " / "))
+
+            # but not the breadcrumbs above it
+            root.get_breadcrumbs(False, True, " / ")
+            bar.set_header("flat-url", "true")
+            self.assertIsNotNone(root.breadcrumbs_cache)
+            self.assertEqual(
+                "<a href=\"/foo/\">Food</a> / <a href=\"/bar/\">Bar</a>",
+                bar.get_breadcrumbs(False, False, " / "))
+
     def test_find_node_by_path_with_exceptions_by_default(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -1405,6 +1643,28 @@ class TestNode(unittest.TestCase):
             self.assertTrue(article_cat in meow_tag_nodes)
             self.assertTrue(article_dog in woof_tag_nodes)
 
+    def test_get_tag_count(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            article_dog = uriel.VirtualNode(project_root, "dog", root)
+            article_cat = uriel.VirtualNode(project_root, "cat", root)
+            root.add_child(article_cat)
+            root.add_child(article_dog)
+
+            article_cat.set_header("tags", "pet, meow")
+            article_dog.set_header("tags", "pet, woof")
+
+            self.assertRaises(uriel.UrielError, root.get_tag_count, "pet")
+
+            root.create_tag_node_index()
+
+            self.assertEqual(2, article_cat.get_tag_count("pet"))
+            self.assertEqual(1, article_cat.get_tag_count("meow"))
+            self.assertEqual(0, article_cat.get_tag_count("does-not-exist"))
+
     def test_get_vnode_for_tag(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -2159,6 +2419,103 @@ class TestFileNode(unittest.TestCase):
             self.assertFalse(child.has_header("foo"))
             self.assertEqual("quux", child.get_header("baz"))
 
+    def test_lazy_body(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            nodes_root_dir = os.path.join(project_root, "nodes")
+            os.mkdir(nodes_root_dir)
+
+            with open(os.path.join(nodes_root_dir, "index"), "w") as f:
+                f.write("Title: Home\nColor: red\n\nhome\n")
+
+            node_file = os.path.join(nodes_root_dir, "foo")
+            with open(node_file, "w") as f:
+                f.write("\nline 1\nline 2\n")
+
+            uriel.lazy_node_bodies = True
+            root = uriel.FileNode(project_root, "index")
+            foo = uriel.FileNode(project_root, "foo", root)
+
+            # only the headers are read up front
+            self.assertEqual("Home", root.get_header("title"))
+            self.assertEqual("red", foo.get_header("color"))
+            self.assertIsNone(root.body)
+            self.assertIsNone(foo.body)
+
+            # the body is read the first time it is needed
+            # (the blank line separates the inherited headers from the body)
+            self.assertEqual("home", root.get_body())
+            self.assertEqual("line 1\nline 2", foo.get_body())
+
+            # and can be released, and read again later
+            foo.release_body()
+            self.assertIsNone(foo.body)
+            self.assertEqual("line 1\nline 2", foo.get_body())
+
+    def test_lazy_body_set_body(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            nodes_root_dir = os.path.join(project_root, "nodes")
+            os.mkdir(nodes_root_dir)
+
+            with open(os.path.join(nodes_root_dir, "index"), "w") as f:
+                f.write("Title: Home\n\nhome\n")
+
+            uriel.lazy_node_bodies = True
+            root = uriel.FileNode(project_root, "index")
+
+            # a body set by a handler replaces the node file, and is kept
+            root.set_body("handler body")
+            root.release_body()
+            self.assertEqual("handler body", root.get_body())
+
+            # the rendered body is released separately
+            root.set_rendered_body("rendered")
+            root.release_rendered_body()
+            self.assertIsNone(root.get_rendered_body())
+
+    def test_lazy_body_matches(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            nodes_root_dir = os.path.join(project_root, "nodes")
+            os.mkdir(nodes_root_dir)
+
+            contents = {
+                "index": "Title: Home\n\nhome\n",
+                "headers-only": "Title: Foo\nColor: red\n",
+                "headers-blank": "Title: Foo\n\n",
+                "no-headers": "first: line\nsecond\n",
+                "blank-first": "\n\nbody\n",
+                "empty": "",
+            }
+            for (name, text) in contents.items():
+                with open(os.path.join(nodes_root_dir, name), "w") as f:
+                    f.write(text)
+
+            for name in contents:
+                uriel.lazy_node_bodies = False
+                root = uriel.FileNode(project_root, "index")
+                eager = root
+                if "index" != name:
+                    eager = uriel.FileNode(project_root, name, root)
+
+                uriel.lazy_node_bodies = True
+                root = uriel.FileNode(project_root, "index")
+                lazy = root
+                if "index" != name:
+                    lazy = uriel.FileNode(project_root, name, root)
+
+                self.assertEqual(eager.get_header_key_values(),
+                                 lazy.get_header_key_values(),
+                                 name)
+                self.assertEqual(eager.get_body(), lazy.get_body(), name)
+
 
 class TestVirtualNode(unittest.TestCase):
     """
@@ -0,0 +1,112 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+from .util import write_file
+
+class TestNodeFileReader(unittest.TestCase):
+    """
+    Tests the NodeFileReader class.
+
+    """
+
+    def test_scan(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as nodes_dir:
+            write_file(os.path.join(nodes_dir, "index"), "Title: Home\n")
+            write_file(os.path.join(nodes_dir, "zzz"), "zzz\n")
+            write_file(os.path.join(nodes_dir, "foo/index"), "Title: Foo\n")
+            write_file(os.path.join(nodes_dir, ".hidden"), "hidden\n")
+            write_file(os.path.join(nodes_dir, "bar~"), "backup\n")
+
+            reader = uriel.NodeFileReader()
+            try:
+                reader.scan(nodes_dir)
+
+                self.assertEqual([("foo", False, True),
+                                  ("index", True, False),
+                                  ("zzz", True, False)],
+                                 reader.get_entries(nodes_dir))
+                self.assertEqual([("index", True, False)],
+                                 reader.get_entries(
+                                     os.path.join(nodes_dir, "foo")))
+                self.assertEqual(
+                    sorted([os.path.join(nodes_dir, "index"),
+                            os.path.join(nodes_dir, "zzz"),
+                            os.path.join(nodes_dir, "foo/index")]),
+                    sorted(reader.files.keys()))
+
+                path = os.path.join(nodes_dir, "foo/index")
+                (modified, headers, body_lines, body_start) = \
+                    reader.read(path)
+                self.assertEqual(os.path.getmtime(path), modified)
+                self.assertEqual([("title", "Foo")], headers)
+
+                # each file is only handed out once
+                self.assertNotIn(path, reader.files)
+
+            finally:
+                reader.close()
+
+            self.assertEqual({}, reader.files)
+
+    def test_read_not_scanned(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as nodes_dir:
+            path = os.path.join(nodes_dir, "index")
+            write_file(path, "Title: Home\n\nhome\n")
+
+            reader = uriel.NodeFileReader()
+            try:
+                (modified, headers, body_lines, body_start) = \
+                    reader.read(path)
+            finally:
+                reader.close()
+
+            self.assertEqual([("title", "Home")], headers)
+            self.assertEqual(["home"], body_lines)
+
+    def test_read_error(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as nodes_dir:
+            path = os.path.join(nodes_dir, "index")
+            write_file(path, "Title: Home\n")
+
+            reader = uriel.NodeFileReader()
+            try:
+                reader.scan(nodes_dir)
+                os.unlink(path)
+
+                # the error is raised in the thread asking for the file
+                self.assertRaises(uriel.UrielError, reader.read, path)
+                self.assertRaises(uriel.UrielError,
+                                  reader.read,
+                                  os.path.join(nodes_dir, "missing"))
+
+            finally:
+                reader.close()
+
+    def test_get_entries_error(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as nodes_dir:
+            dir_path = os.path.join(nodes_dir, "missing")
+
+            reader = uriel.NodeFileReader()
+            try:
+                with self.assertRaises(uriel.UrielError) as cm:
+                    reader.get_entries(dir_path)
+
+            finally:
+                reader.close()
+
+            self.assertTrue(str(cm.exception).startswith(
+                "could not read directory '%s'" % (dir_path)))
@@ -0,0 +1,120 @@
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+
+class TestNodeHeaders(unittest.TestCase):
+    """
+    Tests the NodeHeaders class.
+
+    """
+
+    def test_dict(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        headers = uriel.NodeHeaders()
+        self.assertEqual(0, len(headers))
+        self.assertNotIn("foo", headers)
+
+        headers["foo"] = "bar"
+        headers["baz"] = "quux"
+        self.assertIn("foo", headers)
+        self.assertEqual("bar", headers["foo"])
+        self.assertEqual(2, len(headers))
+        self.assertEqual(["baz", "foo"], sorted(headers.keys()))
+        self.assertEqual([("baz", "quux"), ("foo", "bar")],
+                         sorted(headers.items()))
+
+        del(headers["foo"])
+        self.assertNotIn("foo", headers)
+        self.assertEqual(1, len(headers))
+        self.assertRaises(KeyError, headers.__getitem__, "foo")
+        self.assertRaises(KeyError, headers.__delitem__, "foo")
+
+    def test_inherited(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        parent = uriel.NodeHeaders()
+        parent["foo"] = "bar"
+        parent["baz"] = "quux"
+
+        child = uriel.NodeHeaders(parent)
+        self.assertEqual("bar", child["foo"])
+        self.assertEqual(2, len(child))
+
+        # override an inherited header
+        child["foo"] = "child"
+        self.assertEqual("child", child["foo"])
+        self.assertEqual("bar", parent["foo"])
+        self.assertEqual(2, len(child))
+
+        # delete an inherited (and overridden) header
+        del(child["foo"])
+        self.assertNotIn("foo", child)
+        self.assertIn("foo", parent)
+        self.assertEqual(1, len(child))
+        self.assertEqual([("baz", "quux")], child.items())
+
+        # and set it again
+        child["foo"] = "again"
+        self.assertEqual("again", child["foo"])
+        self.assertEqual(2, len(child))
+
+    def test_snapshot(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        parent = uriel.NodeHeaders()
+        parent["foo"] = "bar"
+
+        child = uriel.NodeHeaders(parent)
+        sibling = uriel.NodeHeaders(parent)
+
+        # siblings share the same inherited headers
+        self.assertIs(child.inherited, sibling.inherited)
+
+        # a child without any changes of its own shares them too
+        grandchild = uriel.NodeHeaders(child)
+        self.assertIs(child.inherited, grandchild.inherited)
+
+        # headers set on the parent later on are not inherited
+        parent["later"] = "value"
+        del(parent["foo"])
+        self.assertNotIn("later", child)
+        self.assertEqual("bar", child["foo"])
+        self.assertIn("later", uriel.NodeHeaders(parent))
+
+    def test_prefixed_keys(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        parent = uriel.NodeHeaders()
+        parent["+foo"] = "a"
+        parent["++foo"] = "b"
+        parent["-bar"] = "*"
+        parent["baz"] = "c"
+
+        child = uriel.NodeHeaders(parent)
+        self.assertEqual(["++foo", "+foo", "-bar"],
+                         child.get_prefixed_keys())
+
+        del(child["+foo"])
+        child["+quux"] = "d"
+        self.assertEqual(["++foo", "+quux", "-bar"],
+                         child.get_prefixed_keys())
+
+    def test_interned_keys(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            nodes = []
+            for i in range(2):
+                node = uriel.VirtualNode(project_root, "node-%d" % (i))
+                node.set_header("".join(["some", "-", "header"]), "value")
+                nodes.append(node)
+
+            self.assertIs(nodes[0].headers.keys()[0],
+                          nodes[1].headers.keys()[0])
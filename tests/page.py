@@ -490,6 +490,44 @@ class TestPage(unittest.TestCase):
             self.assertEqual(uriel.Token.LITERAL, actual[0].type)
             self.assertEqual("{{value:foo}", actual[0].value)
 
+    def test_tokenize_unidentified_and_incomplete(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            page = uriel.Page(project_root, root)
+
+            expected = [
+                uriel.Token("a "),
+                uriel.Token("{{foo:bar}}"),
+                uriel.Token("{{value:foo}}"),
+                uriel.Token(" }} "),
+                uriel.Token("{{ value:bar"),
+            ]
+            actual = page.tokenize("a {{foo:bar}}{{value:foo}} }} {{ value:bar")
+
+            self.assertEqual(expected, actual)
+            self.assertTrue(actual[1].has_unidentified_parameter())
+            self.assertEqual(uriel.Token.LITERAL, actual[4].type)
+
+    def test_tokenize_long_line(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            page = uriel.Page(project_root, root)
+
+            line = "<p>foo</p>{{value:foo}}" * 10000
+            actual = page.tokenize(line)
+
+            self.assertEqual(20000, len(actual))
+            self.assertEqual(uriel.Token("<p>foo</p>"), actual[-2])
+            self.assertEqual(uriel.Token("{{value:foo}}"), actual[-1])
+            self.assertEqual(line,
+                             "".join([t.original_string for t in actual]))
+
     def test_text_to_html_none(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -1325,6 +1363,9 @@ class TestPage(unittest.TestCase):
                 )
             )
 
+            self.assertEqual({"a.html", "b.html"},
+                             page.dependencies.templates)
+
     def test_merge_token_created(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -1867,6 +1908,9 @@ class TestPage(unittest.TestCase):
                 "/child/",
                 page.merge_token_node_url(uriel.Token("{{node-url:child/index}}")))
 
+            self.assertEqual({"index", "child/index"},
+                             page.dependencies.nodes)
+
             self.assertRaises(
                 uriel.UrielError,
                 page.merge_token_node_url,
@@ -2065,6 +2109,71 @@ class TestPage(unittest.TestCase):
                 "foo",
                 page.merge_token_tag_list(uriel.Token("{{tag-list:*}}")))
 
+    def test_merge_token_tag_page_invalid(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            page = uriel.Page(project_root, root)
+
+            self.assertRaises(
+                uriel.UrielError,
+                page.merge_token_tag_page,
+                uriel.Token("{{tag-page:fail}}"))
+
+    def test_merge_token_tag_page_no_header(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            page = uriel.Page(project_root, root)
+
+            self.assertEqual(
+                "",
+                page.merge_token_tag_page(uriel.Token("{{tag-page:next}}")))
+            self.assertEqual(
+                "",
+                page.merge_token_tag_page(
+                    uriel.Token("{{tag-page:previous}}")))
+
+    def test_merge_token_tag_page(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            root.set_header("canonical-url", "https://example.com")
+            foo = uriel.VirtualNode(project_root, "foo", root)
+            foo_2 = uriel.VirtualNode(project_root, "foo/2", foo)
+            root.add_child(foo)
+            foo.add_child(foo_2)
+
+            foo.set_header("__tag-page-previous", "")
+            foo.set_header("__tag-page-next", "foo/2")
+
+            page = uriel.Page(project_root, foo, use_canonical_url=False)
+            self.assertEqual(
+                "<a href=\"/foo/2/\">Next</a>",
+                page.merge_token_tag_page(uriel.Token("{{tag-page:next}}")))
+            self.assertEqual(
+                "",
+                page.merge_token_tag_page(
+                    uriel.Token("{{tag-page:previous}}")))
+
+            foo_2.set_header("__tag-page-previous", "foo")
+            foo_2.set_header("__tag-page-next", "")
+
+            page = uriel.Page(project_root, foo_2, use_canonical_url=True)
+            self.assertEqual(
+                "<a href=\"https://example.com/foo/\">Previous</a>",
+                page.merge_token_tag_page(
+                    uriel.Token("{{tag-page:previous}}")))
+            self.assertEqual(
+                "",
+                page.merge_token_tag_page(uriel.Token("{{tag-page:next}}")))
+
     def test_merge_token_soju(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -0,0 +1,71 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+
+class TestPageWriter(unittest.TestCase):
+    """
+    Tests the PageWriter class.
+
+    """
+
+    def test_write(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            writer = uriel.PageWriter()
+
+            files = []
+            for i in range(20):
+                node = uriel.VirtualNode(project_root, "page-%d" % (i))
+                directory = os.path.join(project_root, "public/page-%d" % (i))
+                file = os.path.join(directory, "index.html")
+
+                writer.make_dirs(directory)
+                writer.write(node, file, "page %d" % (i))
+                files.append(file)
+
+            writer.close()
+
+            for i in range(20):
+                with open(files[i], "r") as f:
+                    self.assertEqual("page %d" % (i), f.read())
+
+    def test_make_dirs(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            writer = uriel.PageWriter()
+
+            directory = os.path.join(project_root, "public/foo/bar")
+            writer.make_dirs(directory)
+            writer.close()
+
+            self.assertTrue(os.path.isdir(directory))
+            self.assertIn(directory, writer.created_dirs)
+            self.assertIn(os.path.join(project_root, "public/foo"),
+                          writer.created_dirs)
+            self.assertIn(os.path.join(project_root, "public"),
+                          writer.created_dirs)
+
+            # directories we already created are not checked again
+            os.rmdir(directory)
+            writer.make_dirs(directory)
+            self.assertFalse(os.path.exists(directory))
+
+    def test_close_raises_write_errors(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            writer = uriel.PageWriter()
+
+            node = uriel.VirtualNode(project_root, "index")
+            file = os.path.join(project_root, "does-not-exist/index.html")
+
+            writer.write(node, file, "foo")
+
+            self.assertRaises(uriel.UrielError, writer.close)
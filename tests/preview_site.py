@@ -0,0 +1,143 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+from .util import write_file
+
+def create_site(uriel, project_root):
+    """
+    Create a small project, and load it into a PreviewSite.
+
+    """
+
+    write_file(os.path.join(project_root, "templates/default.html"),
+               "<h1>{{node:title}}</h1>\n{{node:body}}\n")
+    write_file(os.path.join(project_root, "nodes/index"),
+               "Title: Home\n\nhome\n")
+    write_file(os.path.join(project_root, "nodes/foo"),
+               "Title: Foo\n\nfoo\n")
+    write_file(os.path.join(project_root, "static/style.css"),
+               "body { color: black; }\n")
+    write_file(os.path.join(project_root, "secret"),
+               "secret\n")
+
+    site = uriel.PreviewSite(project_root)
+    site.load()
+
+    return site
+
+class TestPreviewSite(unittest.TestCase):
+    """
+    Tests the PreviewSite class.
+
+    """
+
+    def test_load(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            self.assertEqual(["/", "/foo/"], sorted(site.urls.keys()))
+            self.assertEqual({}, site.pages)
+            self.assertEqual("serving 2 pages", c.stderr[-1])
+
+            # pages are not written, but static files are copied
+            self.assertFalse(os.path.exists(
+                os.path.join(project_root, "public/index.html")))
+            self.assertTrue(os.path.isfile(
+                os.path.join(project_root, "public/style.css")))
+
+    def test_get_response_page(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            (status, headers, body) = site.get_response("/foo/?bar=baz")
+            self.assertEqual(200, status)
+            self.assertEqual("text/html; charset=utf-8",
+                             headers["Content-Type"])
+            self.assertEqual(b"<h1>Foo</h1>\nfoo\n", body)
+
+            # rendered pages are cached
+            self.assertIn("/foo/", site.pages)
+
+            (status, headers, body) = site.get_response("/foo/index.html")
+            self.assertEqual(200, status)
+            self.assertEqual(b"<h1>Foo</h1>\nfoo\n", body)
+
+    def test_get_response_redirect(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            (status, headers, body) = site.get_response("/foo")
+            self.assertEqual(301, status)
+            self.assertEqual("/foo/", headers["Location"])
+
+    def test_get_response_static_file(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            (status, headers, body) = site.get_response("/style.css")
+            self.assertEqual(200, status)
+            self.assertEqual("text/css", headers["Content-Type"])
+            self.assertEqual(b"body { color: black; }\n", body)
+
+    def test_get_response_not_found(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            (status, headers, body) = site.get_response("/bar/")
+            self.assertEqual(404, status)
+
+            (status, headers, body) = site.get_response("/../secret")
+            self.assertEqual(404, status)
+
+            (status, headers, body) = site.get_response("/%2e%2e/secret")
+            self.assertEqual(404, status)
+
+    def test_get_response_reloads_changes(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            (status, headers, body) = site.get_response("/foo/")
+            self.assertEqual(b"<h1>Foo</h1>\nfoo\n", body)
+
+            write_file(os.path.join(project_root, "nodes/foo"),
+                       "Title: Foo\n\nfoo changed\n")
+            site.last_check = 0.0
+
+            (status, headers, body) = site.get_response("/foo/")
+            self.assertEqual(b"<h1>Foo</h1>\nfoo changed\n", body)
+            self.assertIn("changed '" + project_root + "/nodes/foo'", c.stderr)
+
+    def test_get_response_load_error(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            site = create_site(uriel, project_root)
+
+            os.mkdir(os.path.join(project_root, "nodes/bar"))
+            write_file(os.path.join(project_root, "nodes/bar/baz"), "baz\n")
+            site.last_check = 0.0
+
+            (status, headers, body) = site.get_response("/foo/")
+            self.assertEqual(500, status)
+            self.assertTrue(body.startswith(b"directory '"))
@@ -0,0 +1,224 @@
+import os
+import re
+import sys
+import types
+import shutil
+import datetime
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+
+class FrozenDateTime(datetime.datetime):
+    """
+    A datetime.datetime class whose now() always returns the same time.
+
+    Tag pages and sitemaps are dated when the project is built, so builds
+    that are compared against each other need to agree on the time.
+
+    """
+
+    frozen = datetime.datetime.now(datetime.timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        if tz is None:
+            return cls.frozen.astimezone().replace(tzinfo=None)
+
+        return cls.frozen.astimezone(tz)
+
+def freeze_time(uriel):
+    """
+    Replace the datetime module used by the given uriel module with one
+    where datetime.datetime.now() always returns the same time.
+
+    """
+
+    frozen_datetime = types.ModuleType("datetime")
+    frozen_datetime.__dict__.update(datetime.__dict__)
+    frozen_datetime.datetime = FrozenDateTime
+
+    uriel.datetime = frozen_datetime
+
+def build_documentation(project_root, engine, low_memory=False):
+    """
+    Build a copy of the documentation/ project with the given render engine,
+    and return the contents of every file in the public directory.
+
+    Optionally builds with --low-memory.
+
+    """
+
+    c = UrielContainer()
+    uriel = c.uriel
+    freeze_time(uriel)
+
+    def ignore(directory, names):
+        if os.path.abspath(directory) == os.path.abspath("documentation"):
+            return ["public"]
+        return [name for name in names if "__pycache__" == name]
+
+    shutil.copytree("documentation", project_root, ignore=ignore)
+
+    options = uriel.BuildOptions()
+    options.engine = engine
+    options.low_memory = low_memory
+
+    try:
+        sys.modules["uriel"] = uriel
+        uriel.build_project(project_root, options)
+
+    finally:
+        uriel.unload_modules()
+        if "uriel" in sys.modules:
+            del(sys.modules["uriel"])
+
+    files = {}
+    public_dir = os.path.join(project_root, "public")
+    for (dirpath, dirnames, filenames) in os.walk(public_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "rb") as f:
+                contents = f.read()
+
+            # the RSS feed includes the time it was built
+            if "rss.xml" == filename:
+                contents = re.sub(rb"<lastBuildDate>.*</lastBuildDate>",
+                                  b"", contents)
+
+            files[os.path.relpath(path, public_dir)] = contents
+
+    return files
+
+class TestFunctionCompileProgram(unittest.TestCase):
+    """
+    Tests the compile_program() function.
+
+    """
+
+    def test_compile_program(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        compiled = uriel.compile_lines(["<h1>{{node:title}}</h1>",
+                                        "<p>",
+                                        "{{node:body}}",
+                                        ""])
+        program = uriel.compile_program(compiled)
+
+        self.assertEqual(5, len(program))
+        self.assertEqual("<h1>", program[0])
+        self.assertIs(uriel.Page.merge_token_node, program[1][0])
+        self.assertEqual(uriel.Token("{{node:title}}"), program[1][1])
+        self.assertEqual("</h1>\n<p>\n", program[2])
+        self.assertIs(uriel.Page.merge_token_node, program[3][0])
+        self.assertEqual(uriel.Token("{{node:body}}"), program[3][1])
+        self.assertEqual("\n", program[4])
+
+    def test_compile_program_trailing_literal(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        program = uriel.compile_program(uriel.compile_lines(["foo", "bar"]))
+        self.assertEqual(["foo\nbar"], program)
+
+        program = uriel.compile_program([])
+        self.assertEqual([], program)
+
+    def test_compile_program_unidentified_parameter(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        program = uriel.compile_program(uriel.compile_lines(["a {{foo:bar}}"]))
+
+        self.assertEqual(2, len(program))
+        self.assertEqual("a ", program[0])
+        self.assertIs(uriel.Page.merge_token_literal, program[1][0])
+
+
+class TestRenderEngine(unittest.TestCase):
+    """
+    Tests that the interpreter and compiled render engines produce
+    identical output.
+
+    """
+
+    def test_render_engines(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            os.mkdir(os.path.join(project_root, "templates"))
+            with open(os.path.join(project_root,
+                                   "templates/default.html"), "w") as f:
+                f.write("<h1>{{node:title}}</h1>\n\n{{node:body}}\n")
+
+            node = uriel.VirtualNode(project_root, "index")
+            node.set_header("title", "Foo")
+            node.set_body("foo {{node-title:index}}\nbar\n")
+
+            rendered = {}
+            for engine in uriel.RENDER_ENGINES:
+                uriel.render_engine = engine
+                rendered[engine] = uriel.Page(project_root, node).render()
+
+            self.assertEqual("<h1>Foo</h1>\n\nfoo Foo\nbar\n",
+                             rendered["interpreter"])
+            self.assertEqual(rendered["interpreter"], rendered["compiled"])
+
+    def test_render_engines_error(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            os.mkdir(os.path.join(project_root, "templates"))
+            with open(os.path.join(project_root,
+                                   "templates/default.html"), "w") as f:
+                f.write("<h1>{{node:title}}</h1>\n{{node:body}}\n")
+
+            node = uriel.VirtualNode(project_root, "index")
+            node.set_header("title", "Foo")
+            node.set_body("foo {{foo:bar}}\n")
+
+            errors = {}
+            for engine in uriel.RENDER_ENGINES:
+                del(c.stderr[:])
+                uriel.render_engine = engine
+                with self.assertRaises(uriel.UrielError):
+                    uriel.Page(project_root, node).render()
+                errors[engine] = list(c.stderr)
+
+            self.assertIn("        '{{foo:bar}}'", errors["interpreter"])
+            self.assertEqual(errors["interpreter"], errors["compiled"])
+
+    def test_documentation(self):
+        # some pages include the project path, so build both in the same place
+        with TempDir() as tmp_dir:
+            project_root = os.path.join(tmp_dir, "documentation")
+
+            interpreter = build_documentation(project_root, "interpreter")
+            shutil.rmtree(project_root)
+            compiled = build_documentation(project_root, "compiled")
+
+            self.assertIn("index.html", interpreter)
+            self.assertEqual(sorted(interpreter.keys()),
+                             sorted(compiled.keys()))
+
+            for path in interpreter:
+                self.assertEqual(interpreter[path], compiled[path], path)
+
+    def test_documentation_low_memory(self):
+        # some pages include the project path, so build both in the same place
+        with TempDir() as tmp_dir:
+            project_root = os.path.join(tmp_dir, "documentation")
+
+            default = build_documentation(project_root, "interpreter")
+            shutil.rmtree(project_root)
+            low_memory = build_documentation(project_root,
+                                             "interpreter",
+                                             low_memory=True)
+
+            self.assertEqual(sorted(default.keys()), sorted(low_memory.keys()))
+
+            for path in default:
+                self.assertEqual(default[path], low_memory[path], path)
@@ -0,0 +1,96 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+from .util import build
+
+from benchmarks.memory import measure_memory
+from benchmarks.site_generator import SiteOptions
+from benchmarks.site_generator import generate_site
+from benchmarks.site_generator import get_directories
+from benchmarks.sorting import create_children
+
+class TestSiteGenerator(unittest.TestCase):
+    """
+    Tests the synthetic project generator used by the benchmark suite.
+
+    """
+
+    def test_get_directories(self):
+        options = SiteOptions(nodes=100, depth=2, fan_out=2)
+        self.assertEqual(["",
+                          "dir-0",
+                          "dir-1",
+                          "dir-0/dir-0",
+                          "dir-0/dir-1",
+                          "dir-1/dir-0",
+                          "dir-1/dir-1"],
+                         get_directories(options))
+
+        # never more directories than there are nodes to put in them
+        options = SiteOptions(nodes=4, depth=2, fan_out=10)
+        self.assertEqual(["", "dir-0", "dir-1"], get_directories(options))
+
+    def test_generate_site(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            options = SiteOptions(nodes=30,
+                                  depth=2,
+                                  fan_out=2,
+                                  tags=5,
+                                  tags_per_node=2,
+                                  include_depth=3,
+                                  soju_calls=2)
+
+            self.assertEqual(30, generate_site(project_root, options))
+
+            node_files = 0
+            for (dirpath, dirnames, filenames) in \
+                    os.walk(os.path.join(project_root, "nodes")):
+                node_files += len(filenames)
+            self.assertEqual(30, node_files)
+
+            build(uriel, project_root)
+
+            self.assertEqual(0, c.exit_code)
+
+            with open(os.path.join(project_root,
+                                   "public/dir-0/page-9/index.html")) as f:
+                contents = f.read()
+
+            self.assertIn("<h1>Page 9</h1>", contents)
+            self.assertIn("<p>page-9-1</p>", contents)
+            self.assertIn("<div class=\"include-3\">", contents)
+
+            self.assertTrue(os.path.isfile(
+                os.path.join(project_root, "public/tag/tag-0/index.html")))
+
+    def test_measure_memory(self):
+        with TempDir() as project_root:
+            options = SiteOptions(nodes=30, depth=1, fan_out=2)
+            generate_site(project_root, options)
+
+            result = measure_memory("uriel", project_root)
+
+            self.assertTrue(result["slots"])
+            self.assertEqual(30, result["nodes"])
+            self.assertEqual(30, result["pages"])
+            self.assertGreater(result["tokens"], 30)
+            self.assertGreater(result["bytes_per_node"], 0)
+            self.assertGreater(result["bytes_per_token"], 0)
+            self.assertGreater(result["bytes_per_page"], 0)
+
+    def test_create_children(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        root = create_children(uriel, 100)
+        children = root.get_children()
+
+        self.assertEqual(100, len(children))
+        for i in range(len(children) - 1):
+            self.assertLess(children[i].get_sort_key(),
+                            children[i + 1].get_sort_key())
@@ -0,0 +1,66 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+
+class TestSourceFileCache(unittest.TestCase):
+    """
+    Tests the SourceFileCache class.
+
+    """
+
+    def test_read_lines(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo")
+            with open(path, "w") as f:
+                f.write("foo\nbar\n")
+
+            cache = uriel.SourceFileCache()
+            self.assertEqual(["foo\n", "bar\n"], cache.read_lines(path))
+
+    def test_read_lines_cached(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo")
+            with open(path, "w") as f:
+                f.write("foo\n")
+
+            cache = uriel.SourceFileCache()
+            lines = cache.read_lines(path)
+
+            # same modification time and size, so the file isn't read again
+            self.assertIs(lines, cache.read_lines(path))
+
+    def test_read_lines_changed(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo")
+            with open(path, "w") as f:
+                f.write("foo\n")
+
+            cache = uriel.SourceFileCache()
+            self.assertEqual(["foo\n"], cache.read_lines(path))
+
+            with open(path, "w") as f:
+                f.write("foo\nbar\n")
+
+            self.assertEqual(["foo\n", "bar\n"], cache.read_lines(path))
+
+    def test_read_lines_missing_file(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            cache = uriel.SourceFileCache()
+
+            self.assertRaises(FileNotFoundError,
+                              cache.read_lines,
+                              os.path.join(tmp_dir, "foo"))
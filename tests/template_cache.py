@@ -0,0 +1,108 @@
+import os
+import unittest
+
+from .util import UrielContainer
+from .util import TempDir
+
+class TestTemplateCache(unittest.TestCase):
+    """
+    Tests the TemplateCache class.
+
+    """
+
+    def test_get(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo.html")
+            with open(path, "w") as f:
+                f.write("<p>  \n<h1>{{node:title}}</h1>\n")
+
+            cache = uriel.TemplateCache()
+            compiled = cache.get(path)
+
+            self.assertEqual(2, len(compiled))
+            self.assertEqual("<p>", compiled[0])
+            self.assertEqual([uriel.Token("<h1>"),
+                              uriel.Token("{{node:title}}"),
+                              uriel.Token("</h1>")],
+                             compiled[1])
+
+    def test_get_cached(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo.html")
+            with open(path, "w") as f:
+                f.write("{{node:body}}\n")
+
+            cache = uriel.TemplateCache()
+            compiled = cache.get(path)
+
+            # same modification time and size, so the file isn't read again
+            self.assertIs(compiled, cache.get(path))
+
+    def test_get_changed(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo.html")
+            with open(path, "w") as f:
+                f.write("foo\n")
+
+            cache = uriel.TemplateCache()
+            self.assertEqual(["foo"], cache.get(path))
+
+            with open(path, "w") as f:
+                f.write("bar\n")
+            os.utime(path, ns=(0, 0))
+
+            self.assertEqual(["bar"], cache.get(path))
+
+    def test_get_missing_file(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            cache = uriel.TemplateCache()
+
+            self.assertRaises(FileNotFoundError,
+                              cache.get,
+                              os.path.join(tmp_dir, "foo.html"))
+
+    def test_shared_between_pages(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            os.mkdir(os.path.join(project_root, "templates"))
+            with open(os.path.join(project_root,
+                                   "templates/default.html"), "w") as f:
+                f.write("<h1>{{node:title}}</h1>\n{{include:footer.html}}\n")
+            with open(os.path.join(project_root,
+                                   "templates/footer.html"), "w") as f:
+                f.write("<p>{{node-title:index}}</p>\n")
+
+            root = uriel.VirtualNode(project_root, "index")
+            root.set_header("title", "Home")
+            foo = uriel.VirtualNode(project_root, "foo", root)
+            foo.set_header("title", "Foo")
+
+            self.assertEqual("<h1>Home</h1>\n<p>Home</p>\n",
+                             uriel.Page(project_root, root).render())
+
+            compiled = dict(uriel.template_cache.templates)
+            self.assertEqual(
+                sorted([os.path.join(project_root, "templates/default.html"),
+                        os.path.join(project_root, "templates/footer.html")]),
+                sorted(compiled.keys()))
+
+            self.assertEqual("<h1>Foo</h1>\n<p>Home</p>\n",
+                             uriel.Page(project_root, foo).render())
+
+            for path in compiled:
+                self.assertIs(compiled[path][2],
+                              uriel.template_cache.templates[path][2])
@@ -308,6 +308,18 @@ class TestToken(unittest.TestCase):
         self.assertEqual("*", token.value)
         self.assertFalse(token.has_unidentified_parameter())
 
+    def test_tag_page(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        s = "{{tag-page:next}}"
+        token = uriel.Token(s)
+
+        self.assertEqual(s, token.original_string)
+        self.assertEqual("tag-page", token.type)
+        self.assertEqual("next", token.value)
+        self.assertFalse(token.has_unidentified_parameter())
+
     def test_soju(self):
         c = UrielContainer()
         uriel = c.uriel
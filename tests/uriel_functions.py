@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 import time
 import gzip
@@ -159,12 +160,37 @@ class TestFunctionShowUsage(unittest.TestCase):
         uriel = c.uriel
 
         uriel.show_usage()
-        self.assertEqual(3, len(c.stderr))
+        self.assertEqual(12, len(c.stderr))
         self.assertEqual("uriel " + uriel.VERSION, c.stderr[0])
-        self.assertEqual("Usage: uriel <project-root>", c.stderr[1])
+        self.assertEqual("Usage: uriel [options] <project-root>", c.stderr[1])
+        self.assertEqual("Options:", c.stderr[2])
+        self.assertEqual(
+            "  --incremental   reuse unchanged pages from the previous build",
+            c.stderr[3])
+        self.assertEqual(
+            "  --jobs N        render pages with N worker processes",
+            c.stderr[4])
+        self.assertEqual(
+            "  --watch         rebuild whenever the project changes",
+            c.stderr[5])
+        self.assertEqual(
+            "  --serve         preview the project at http://127.0.0.1:8000/",
+            c.stderr[6])
+        self.assertEqual(
+            "  --port N        preview server port",
+            c.stderr[7])
+        self.assertEqual(
+            "  --profile       report where the build time goes",
+            c.stderr[8])
+        self.assertEqual(
+            "  --engine NAME   render engine: interpreter (default) or compiled",
+            c.stderr[9])
+        self.assertEqual(
+            "  --low-memory    only keep node bodies in memory while needed",
+            c.stderr[10])
         self.assertEqual(
             "See the uriel(1) man page, or https://uriel.foo/ for more information",
-            c.stderr[2])
+            c.stderr[11])
         self.assertEqual(1, c.exit_code)
 
 
@@ -1823,6 +1849,143 @@ class TestFunctionCreateFileNodeTree(unittest.TestCase):
             self.assertEqual("foo/bar/baz/index", baz.get_path())
             self.assertEqual("foo/bar/baz/quux", quux.get_path())
 
+    def test_create_file_node_tree_deterministic(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            nodes_dir = os.path.join(project_root, "nodes")
+            os.makedirs(os.path.join(nodes_dir, "foo"))
+
+            with open(os.path.join(nodes_dir, "index"), "w") as f:
+                f.write("Title: Home\nColor: red\n+Size: big\n\nhome\n")
+
+            with open(os.path.join(nodes_dir, "foo/index"), "w") as f:
+                f.write("Title: Foo\n-Color: *\n\nfoo\n")
+
+            for i in range(50):
+                with open(os.path.join(nodes_dir, "foo/page-%02d" % (i)),
+                          "w") as f:
+                    f.write("\npage %d\n" % (i))
+
+            # hidden files and emacs backup files are not nodes
+            with open(os.path.join(nodes_dir, ".hidden"), "w") as f:
+                f.write("hidden\n")
+            with open(os.path.join(nodes_dir, "index~"), "w") as f:
+                f.write("backup\n")
+
+            root = uriel.create_file_node_tree(project_root)
+            foo = root.find_node_by_path("foo/index")
+
+            # children are linked in sorted order
+            self.assertEqual(["foo/index"],
+                             [node.get_path() for node in root.children])
+            self.assertEqual(["foo/page-%02d" % (i) for i in range(50)],
+                             [node.get_path() for node in foo.children])
+
+            # headers are inherited in tree order, whichever file was
+            # read first
+            self.assertFalse(foo.has_header("color"))
+            self.assertEqual("big", foo.get_header("size"))
+            page = root.find_node_by_path("foo/page-07")
+            self.assertFalse(page.has_header("color"))
+            self.assertEqual("Foo", foo.get_header("title"))
+
+            # the blank line separating inherited headers is not body text
+            self.assertEqual("page 7", page.get_body())
+            self.assertEqual("home", root.get_body())
+
+    def test_create_file_node_tree_missing_index(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            nodes_dir = os.path.join(project_root, "nodes")
+            os.makedirs(os.path.join(nodes_dir, "foo"))
+
+            with open(os.path.join(nodes_dir, "index"), "w") as f:
+                f.write("Title: Home\n\nhome\n")
+
+            with open(os.path.join(nodes_dir, "foo/bar"), "w") as f:
+                f.write("bar\n")
+
+            with self.assertRaises(uriel.UrielError) as cm:
+                uriel.create_file_node_tree(project_root)
+
+            dir_path = os.path.join(nodes_dir, "foo")
+            self.assertEqual(
+                "directory '%s' exists, but '%s/index' node not found" %
+                (dir_path, dir_path),
+                str(cm.exception))
+
+
+class TestFunctionReadNodeFile(unittest.TestCase):
+    """
+    Tests the read_node_file() function.
+
+    """
+
+    def test_read_node_file(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo")
+            with open(path, "w") as f:
+                f.write("Title: Foo\nSOME-Header :  bar: baz \n\n" +
+                        "line 1\nline 2  \n")
+
+            (modified, headers, body_lines, body_start) = \
+                uriel.read_node_file(path, 1234.5)
+
+            self.assertEqual(1234.5, modified)
+            self.assertEqual([("title", "Foo"),
+                              ("some-header", "bar: baz")],
+                             headers)
+            self.assertEqual(["line 1", "line 2"], body_lines)
+            self.assertEqual(3, body_start)
+
+            (modified, headers, body_lines, body_start) = \
+                uriel.read_node_file(path)
+            self.assertEqual(os.path.getmtime(path), modified)
+
+    def test_read_node_file_without_headers(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo")
+
+            with open(path, "w") as f:
+                f.write("no headers here\nTitle: Foo\n")
+
+            (modified, headers, body_lines, body_start) = \
+                uriel.read_node_file(path)
+            self.assertEqual([], headers)
+            self.assertEqual(["no headers here", "Title: Foo"], body_lines)
+
+            # the leading blank line is kept, for FileNode to deal with
+            with open(path, "w") as f:
+                f.write("\nfoo\n")
+
+            (modified, headers, body_lines, body_start) = \
+                uriel.read_node_file(path)
+            self.assertEqual([], headers)
+            self.assertEqual(["", "foo"], body_lines)
+
+    def test_read_node_file_missing(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "foo")
+
+            with self.assertRaises(uriel.UrielError) as cm:
+                uriel.read_node_file(path)
+
+            self.assertTrue(str(cm.exception).startswith(
+                "could not read node file '%s'" % (path)))
+
 
 class TestFunctionCreateTagNodeTree(unittest.TestCase):
     """
@@ -1981,6 +2144,237 @@ class TestFunctionCreateTagNodeTree(unittest.TestCase):
                 tag_d.get_header("__tag-list-html-canonical"))
 
 
+    def test_create_tag_node_tree_tag_count_and_vnode_cache(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+            foo = uriel.VirtualNode(project_root, "foo", root)
+            bar = uriel.VirtualNode(project_root, "bar", root)
+            tag = uriel.VirtualNode(project_root, "tag", root)
+
+            root.add_child(foo)
+            root.add_child(bar)
+            root.add_child(tag)
+
+            root.set_header("tag-node", "tag")
+            foo.set_header("tags", "a, b")
+            bar.set_header("tags", "a")
+
+            uriel.create_tag_node_tree(project_root, root, False)
+
+            tag_a = root.find_node_by_path("tag/a")
+            tag_b = root.find_node_by_path("tag/b")
+
+            # Tag-Count
+            self.assertEqual("2", tag.get_header("tag-count"))
+            self.assertEqual("2", tag_a.get_header("tag-count"))
+            self.assertEqual("1", tag_b.get_header("tag-count"))
+
+            # the vnodes are cached as they are created
+            self.assertEqual({"a": tag_a, "b": tag_b}, root.tag_vnode_cache)
+            self.assertIs(tag_a, foo.get_vnode_for_tag("a"))
+
+    def create_paginated_tree(self, uriel, project_root, tag_page_size):
+        """
+        Create a tree with five nodes tagged "a", and one tagged "b".
+
+        """
+
+        tz = datetime.timezone.utc
+
+        root = uriel.VirtualNode(project_root, "index")
+        root.set_header("tag-node", "tag")
+        root.set_header("tag-page-size", tag_page_size)
+
+        tag = uriel.VirtualNode(project_root, "tag", root)
+        tag.set_header("template", "tag.html")
+        root.add_child(tag)
+
+        for i in range(5):
+            node = uriel.VirtualNode(project_root, "node-%d" % (i), root)
+            node.created = datetime.datetime(2020 + i, 1, 1, tzinfo=tz)
+            node.set_header("tags", "a")
+            root.add_child(node)
+
+        root.find_node_by_path("node-0").set_header("tags", "a, b")
+
+        return root
+
+    def test_create_tag_node_tree_paginated(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = self.create_paginated_tree(uriel, project_root, "2")
+
+            uriel.create_tag_node_tree(project_root, root, False)
+
+            tag_a = root.find_node_by_path("tag/a")
+            tag_a_2 = root.find_node_by_path("tag/a/2")
+            tag_a_3 = root.find_node_by_path("tag/a/3")
+            tag_b = root.find_node_by_path("tag/b")
+
+            # newest first, two to a page
+            self.assertEqual(
+                "<p><a href=\"/node-4/\">Node 4</a></p>\n" + \
+                "<p><a href=\"/node-3/\">Node 3</a></p>",
+                tag_a.get_header("__tag-list-html"))
+            self.assertEqual(
+                "<p><a href=\"/node-2/\">Node 2</a></p>\n" + \
+                "<p><a href=\"/node-1/\">Node 1</a></p>",
+                tag_a_2.get_header("__tag-list-html"))
+            self.assertEqual(
+                "<p><a href=\"/node-0/\">Node 0</a></p>",
+                tag_a_3.get_header("__tag-list-html"))
+
+            # the pages look like the first one
+            self.assertEqual("/tag/a/2/", tag_a_2.get_url())
+            self.assertEqual("a", tag_a_2.get_title())
+            self.assertEqual("tag.html", tag_a_3.get_header("template"))
+            self.assertEqual("5", tag_a_3.get_header("tag-count"))
+            self.assertEqual([tag_a_2, tag_a_3], tag_a.children)
+
+            # page numbers, and links between the pages
+            self.assertEqual(("1", "3"), (tag_a.get_header("tag-page"),
+                                          tag_a.get_header("tag-pages")))
+            self.assertEqual(("3", "3"), (tag_a_3.get_header("tag-page"),
+                                          tag_a_3.get_header("tag-pages")))
+            self.assertEqual("", tag_a.get_header("__tag-page-previous"))
+            self.assertEqual("tag/a/2", tag_a.get_header("__tag-page-next"))
+            self.assertEqual("tag/a",
+                             tag_a_2.get_header("__tag-page-previous"))
+            self.assertEqual("tag/a/3", tag_a_2.get_header("__tag-page-next"))
+            self.assertEqual("", tag_a_3.get_header("__tag-page-next"))
+
+            # a tag that fits on one page
+            self.assertEqual([], tag_b.children)
+            self.assertEqual("1", tag_b.get_header("tag-pages"))
+            self.assertEqual("", tag_b.get_header("__tag-page-next"))
+
+    def test_create_tag_node_tree_paginated_tag_root(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = self.create_paginated_tree(uriel, project_root, "1")
+
+            uriel.create_tag_node_tree(project_root, root, False)
+
+            tag = root.find_node_by_path("tag")
+            tag_2 = root.find_node_by_path("tag/2")
+
+            self.assertEqual("<p><a href=\"/tag/a/\">a</a></p>",
+                             tag.get_header("__tag-list-html"))
+            self.assertEqual("<p><a href=\"/tag/b/\">b</a></p>",
+                             tag_2.get_header("__tag-list-html"))
+            self.assertEqual("/tag/2/", tag_2.get_url())
+            self.assertEqual("tag/2", tag.get_header("__tag-page-next"))
+
+            # the tag vnodes don't inherit the tag root's pages
+            tag_b = root.find_node_by_path("tag/b")
+            self.assertEqual("", tag_b.get_header("__tag-page-previous"))
+
+    def test_create_tag_node_tree_paginated_node_list(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = self.create_paginated_tree(uriel, project_root, "1")
+
+            uriel.create_tag_node_tree(project_root, root, False)
+            uriel.create_child_node_list_html(root, False)
+
+            tag = root.find_node_by_path("tag")
+            tag_a = root.find_node_by_path("tag/a")
+
+            # the extra pages are children, but they aren't listed
+            self.assertEqual(["tag/2", "tag/a", "tag/b"],
+                             sorted(n.get_path() for n in tag.children))
+            self.assertEqual(
+                "<p><a href=\"/tag/a/\">a</a></p>\n" + \
+                "<p><a href=\"/tag/b/\">b</a></p>",
+                tag.get_header("__node-list-html"))
+
+            self.assertEqual(4, len(tag_a.children))
+            self.assertEqual("", tag_a.get_header("__node-list-html"))
+
+            # and they aren't in the sitemap
+            for page in [root.find_node_by_path("tag/2")] + tag_a.children:
+                self.assertFalse(
+                    page.get_boolean_header_value("sitemap-include", True))
+            self.assertTrue(
+                tag_a.get_boolean_header_value("sitemap-include", True))
+
+    def test_create_tag_node_tree_paginated_tag_conflict(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            root = self.create_paginated_tree(uriel, project_root, "1")
+            root.find_node_by_path("node-1").set_header("tags", "2")
+
+            self.assertRaises(uriel.UrielError,
+                              uriel.create_tag_node_tree,
+                              project_root, root, False)
+
+    def test_create_tag_node_tree_paginated_invalid_size(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            for size in ("-1", "foo"):
+                root = self.create_paginated_tree(uriel, project_root, size)
+
+                self.assertRaises(uriel.UrielError,
+                                  uriel.create_tag_node_tree,
+                                  project_root, root, False)
+
+
+class TestFunctionSortTagNodeIndex(unittest.TestCase):
+    """
+    Tests the sort_tag_node_index() function.
+
+    """
+
+    def test_sort_tag_node_index(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        tz = datetime.timezone.utc
+
+        with TempDir() as project_root:
+            root = uriel.VirtualNode(project_root, "index")
+
+            nodes = []
+            for i in range(5):
+                node = uriel.VirtualNode(project_root, "node-%d" % (i), root)
+                node.created = datetime.datetime(2020 + i, 1, 1, tzinfo=tz)
+                root.add_child(node)
+                nodes.append(node)
+
+            nodes[0].set_header("tags", "odd, even")
+            nodes[1].set_header("tags", "odd")
+            nodes[2].set_header("tags", "even")
+            nodes[3].set_header("tags", "odd")
+            nodes[4].set_header("tags", "even")
+
+            tag_node_index = root.create_tag_node_index()
+            sorted_tag_node_index = uriel.sort_tag_node_index(tag_node_index)
+
+            # newest first, the same order as sorting each tag separately
+            self.assertEqual([nodes[3], nodes[1], nodes[0]],
+                             sorted_tag_node_index["odd"])
+            self.assertEqual([nodes[4], nodes[2], nodes[0]],
+                             sorted_tag_node_index["even"])
+
+            for tag in tag_node_index:
+                self.assertEqual(
+                    sorted(tag_node_index[tag], key=uriel.Node.get_sort_key),
+                    sorted_tag_node_index[tag])
+
+
 class TestFunctionCreateTagLinks(unittest.TestCase):
     """
     Tests the create_tag_links() function.
@@ -2430,6 +2824,47 @@ class TestFunctionRenderNodeTree(unittest.TestCase):
             self.assertEqual("<p>\nbar\n</p>\n", root.get_rendered_body())
             self.assertEqual("<p>\nquux\n</p>\n", child.get_rendered_body())
 
+    def test_render_node_tree_jobs(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            templates_dir = os.path.join(project_root, "templates")
+            template_file = os.path.join(templates_dir, "default.html")
+
+            os.mkdir(templates_dir)
+
+            with open(template_file, "w") as f:
+                f.write("<p>{{value:foo}}</p>\n")
+                f.write("{{node-list:*}}")
+                f.close()
+
+            root = uriel.VirtualNode(project_root, "index")
+            root.set_header("foo", "root")
+
+            children = []
+            for i in range(10):
+                child = uriel.VirtualNode(project_root, "child-%d" % (i), root)
+                child.set_header("foo", "child %d" % (i))
+                root.add_child(child)
+                children.append(child)
+
+            uriel.create_child_node_list_html(root, False)
+
+            try:
+                sys.modules["uriel"] = uriel
+                uriel.render_node_tree(project_root, root, jobs=4)
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+            self.assertTrue(
+                root.get_rendered_body().startswith("<p>root</p>\n"))
+            for i in range(10):
+                self.assertEqual("<p>child %d</p>\n" % (i),
+                                 children[i].get_rendered_body())
+
 
 class TestFunctionGetMaxUrlPathLen(unittest.TestCase):
     """
@@ -3184,6 +3619,49 @@ class TestFunctionWriteRss(unittest.TestCase):
                     "",
                     lines[15])
 
+    def test_write_rss_max_entries_order(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        tz = datetime.timezone.utc
+
+        with TempDir() as project_root:
+            public_dir = os.path.join(project_root, "public")
+            rss_file = os.path.join(public_dir, "rss.xml")
+
+            os.mkdir(public_dir)
+
+            root = uriel.VirtualNode(project_root, "index")
+            root.set_header("canonical-url", "https://example.com")
+            root.set_header("rss-url", "/rss.xml")
+            root.set_header("rss-title", "My Website")
+            root.set_header("rss-description", "All about my website")
+            root.set_header("rss-max-entries", "10")
+
+            # lots of ties on the date, and on the title
+            nodes = []
+            for i in range(50):
+                node = uriel.VirtualNode(project_root, "page-%02d" % (i), root)
+                node.created = datetime.datetime(2020, 1, 1 + (i % 5),
+                                                 tzinfo=tz)
+                node.set_header("title", "Page %d" % (i % 3))
+                node.set_header("rss-include", "true")
+                node.set_body("page %d" % (i))
+                root.add_child(node)
+                nodes.append(node)
+
+            uriel.write_rss(project_root, root)
+
+            with open(rss_file, "r") as f:
+                contents = f.read()
+
+            # the same items, in the same order, as sorting every node
+            expected = sorted(nodes)[:10]
+            links = re.findall(r"<link>https://example.com(/[^<]*)</link>",
+                               contents)
+            self.assertEqual([node.get_url() for node in expected],
+                             links[1:])
+
     def test_write_rss_file_path_root_relative_path(self):
         c = UrielContainer()
         uriel = c.uriel
@@ -5631,6 +6109,7 @@ class TestFunctionGetDefaultMakefileContents(unittest.TestCase):
             "clean:\n" + \
             "\trm -rf ${PUBLIC}/\n" + \
             "\trm -rf ${LIB}/__pycache__\n" + \
+            "\trm -rf .uriel-cache/\n" + \
             "\n" + \
             "preview: site\n" + \
             "\tcd ${PUBLIC}/ && python3 -m http.server\n" + \
@@ -6435,3 +6914,398 @@ class TestFunctionHandleProject(unittest.TestCase):
             self.assertFalse(os.path.exists(os.path.join(project_root, "Makefile")))
             self.assertTrue(os.path.isfile(os.path.join(project_root, "public/index.html")))
 
+    def test_handle_project_jobs(self):
+        def build(project_root, jobs):
+            c = UrielContainer()
+            uriel = c.uriel
+
+            os.makedirs(os.path.join(project_root, "nodes/section"))
+            os.makedirs(os.path.join(project_root, "templates"))
+            os.makedirs(os.path.join(project_root, "static"))
+
+            with open(os.path.join(project_root, "static/style.css"), "w") as f:
+                f.write("body { color: black; }\n")
+
+            with open(os.path.join(project_root, "templates/default.html"), "w") as f:
+                f.write("<link href=\"{{static-hash-url:/style.css}}\">\n")
+                f.write("{{breadcrumbs:*}}\n")
+                f.write("<h1>{{node:title}}</h1>\n")
+                f.write("{{node:body}}\n")
+                f.write("{{node-list:*}}\n")
+
+            with open(os.path.join(project_root, "nodes/index"), "w") as f:
+                f.write("Title: Home\nTag-Node: tag\n\nhome\n")
+
+            with open(os.path.join(project_root, "nodes/section/index"), "w") as f:
+                f.write("Title: Section\n\nsection\n")
+
+            with open(os.path.join(project_root, "nodes/tag"), "w") as f:
+                f.write("Title: Tags\n\ntags\n")
+
+            for i in range(20):
+                path = os.path.join(project_root, "nodes/section/page-%d" % (i))
+                with open(path, "w") as f:
+                    f.write("Title: Page %d\n" % (i))
+                    f.write("Modified: 2024-01-%02d\n" % (i + 1))
+                    f.write("Tags: tag-%d\n\n" % (i % 3))
+                    f.write("page %d links to {{node-link:index}}\n" % (i))
+
+            options = uriel.BuildOptions()
+            options.jobs = jobs
+
+            try:
+                sys.modules["uriel"] = uriel
+                uriel.handle_project(project_root, options)
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+            self.assertEqual(0, c.exit_code)
+
+            files = {}
+            public_dir = os.path.join(project_root, "public")
+            for (dirpath, dirnames, filenames) in os.walk(public_dir):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    with open(path, "rb") as f:
+                        files[os.path.relpath(path, public_dir)] = f.read()
+
+            return files
+
+        with TempDir() as tmp_dir:
+            serial = build(os.path.join(tmp_dir, "serial"), 1)
+            parallel = build(os.path.join(tmp_dir, "parallel"), 4)
+
+            self.assertIn("section/page-0/index.html", serial)
+            self.assertIn("tag/tag-0/index.html", serial)
+            self.assertEqual(serial, parallel)
+
+    def test_handle_project_handler_node_meta(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            os.makedirs(os.path.join(project_root, "nodes"))
+            os.makedirs(os.path.join(project_root, "templates"))
+            os.makedirs(os.path.join(project_root, "lib"))
+
+            with open(os.path.join(project_root, "templates/default.html"), "w") as f:
+                f.write("{{node:body}} ({{soju:word_count(node)}} words)\n")
+
+            with open(os.path.join(project_root, "nodes/index"), "w") as f:
+                f.write("Title: Home\n\none two three\n")
+
+            with open(os.path.join(project_root, "nodes/foo"), "w") as f:
+                f.write("Title: Foo\n\nfour five\n")
+
+            # the handler keeps its own state on each node in node.meta,
+            # since nodes don't take arbitrary attributes
+            with open(os.path.join(project_root, "lib/handlers.py"), "w") as f:
+                f.write(
+                    "def count_words(node):\n" +
+                    "    node.meta[\"word-count\"] = len(node.get_body().split())\n" +
+                    "    for child in node.get_children():\n" +
+                    "        count_words(child)\n" +
+                    "\n" +
+                    "def before_render_node_tree(project_root, root_node):\n" +
+                    "    try:\n" +
+                    "        root_node.word_count = 0\n" +
+                    "        raise HandlerError(\"attribute was set\")\n" +
+                    "    except AttributeError:\n" +
+                    "        pass\n" +
+                    "    count_words(root_node)\n")
+
+            with open(os.path.join(project_root, "lib/soju.py"), "w") as f:
+                f.write(
+                    "def word_count(node):\n" +
+                    "    return str(node.meta[\"word-count\"])\n")
+
+            for module in ("soju", "handlers"):
+                if module in sys.modules:
+                    del(sys.modules[module])
+
+            try:
+                sys.modules["uriel"] = uriel
+                uriel.build_project(project_root, uriel.BuildOptions())
+
+            finally:
+                for module in ("uriel", "soju", "handlers"):
+                    if module in sys.modules:
+                        del(sys.modules[module])
+
+            with open(os.path.join(project_root, "public/index.html")) as f:
+                self.assertEqual("one two three (3 words)\n", f.read())
+
+            with open(os.path.join(project_root, "public/foo/index.html")) as f:
+                self.assertEqual("four five (2 words)\n", f.read())
+
+    def test_handle_project_jobs_format_text_rss(self):
+        def build(project_root, jobs):
+            c = UrielContainer()
+            uriel = c.uriel
+
+            os.makedirs(os.path.join(project_root, "nodes"))
+            os.makedirs(os.path.join(project_root, "templates"))
+
+            with open(os.path.join(project_root, "templates/default.html"), "w") as f:
+                f.write("{{node:body}}\n")
+
+            with open(os.path.join(project_root, "nodes/index"), "w") as f:
+                f.write("Title: Home\n")
+                f.write("Canonical-URL: https://example.com\n")
+                f.write("RSS-URL: /rss.xml\n")
+                f.write("RSS-Description: example\n\n")
+                f.write("home\n")
+
+            for i in range(4):
+                path = os.path.join(project_root, "nodes/page-%d" % (i))
+                with open(path, "w") as f:
+                    f.write("Title: Page %d\n" % (i))
+                    f.write("Modified: 2024-01-%02d\n" % (i + 1))
+                    f.write("Format: text\n")
+                    f.write("RSS-Include: true\n\n")
+                    f.write("page %d\nsecond line\n" % (i))
+
+            options = uriel.BuildOptions()
+            options.jobs = jobs
+
+            try:
+                sys.modules["uriel"] = uriel
+                uriel.handle_project(project_root, options)
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+            self.assertEqual(0, c.exit_code)
+
+            with open(os.path.join(project_root, "public/rss.xml"), "r") as f:
+                rss = f.read()
+
+            # the build date is different every time
+            return re.sub(r"<lastBuildDate>.*</lastBuildDate>", "", rss)
+
+        with TempDir() as tmp_dir:
+            serial = build(os.path.join(tmp_dir, "serial"), 1)
+            parallel = build(os.path.join(tmp_dir, "parallel"), 4)
+
+            # the line breaks are only added once, even though the nodes
+            # were already rendered for their pages
+            self.assertIn("page 0<br>\nsecond line", serial)
+            self.assertNotIn("<br><br>", serial)
+            self.assertEqual(serial, parallel)
+
+    def test_handle_project_tag_page_size(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            os.makedirs(os.path.join(project_root, "nodes"))
+            os.makedirs(os.path.join(project_root, "templates"))
+
+            with open(os.path.join(project_root, "templates/default.html"), "w") as f:
+                f.write("<h1>{{node:title}}</h1>\n")
+                f.write("{{node-list:*}}\n")
+
+            with open(os.path.join(project_root, "nodes/index"), "w") as f:
+                f.write("Title: Home\n")
+                f.write("Canonical-URL: https://example.com\n")
+                f.write("Sitemap-URL: /sitemap.xml\n")
+                f.write("Tag-Node: tag\n")
+                f.write("Tag-Page-Size: 1\n\n")
+                f.write("home\n")
+
+            with open(os.path.join(project_root, "nodes/tag"), "w") as f:
+                f.write("Title: Tags\n\ntags\n")
+
+            for i in range(2):
+                path = os.path.join(project_root, "nodes/page-%d" % (i))
+                with open(path, "w") as f:
+                    f.write("Title: Page %d\n" % (i))
+                    f.write("Tags: a, b\n\n")
+                    f.write("page %d\n" % (i))
+
+            try:
+                sys.modules["uriel"] = uriel
+                uriel.handle_project(project_root, uriel.BuildOptions())
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+            self.assertEqual(0, c.exit_code)
+
+            public_dir = os.path.join(project_root, "public")
+
+            # the extra pages are written
+            for path in ("tag/2", "tag/a/2", "tag/b/2"):
+                self.assertTrue(os.path.isfile(
+                    os.path.join(public_dir, path, "index.html")), path)
+
+            # but the node lists only link to the real tags and pages
+            with open(os.path.join(public_dir, "tag/index.html")) as f:
+                self.assertEqual(
+                    "<h1>Tags</h1>\n" +
+                    "<p><a href=\"/tag/a/\">a</a></p>\n" +
+                    "<p><a href=\"/tag/b/\">b</a></p>\n",
+                    f.read())
+
+            with open(os.path.join(public_dir, "tag/a/index.html")) as f:
+                self.assertEqual("<h1>a</h1>\n", f.read())
+
+            # and the sitemap leaves them out
+            with open(os.path.join(public_dir, "sitemap.xml")) as f:
+                sitemap = f.read()
+
+            self.assertIn("<loc>https://example.com/tag/</loc>", sitemap)
+            self.assertIn("<loc>https://example.com/tag/a/</loc>", sitemap)
+            self.assertNotIn("/2/</loc>", sitemap)
+
+
+class TestFunctionGetWatchSnapshot(unittest.TestCase):
+    """
+    Tests the get_watch_snapshot() function.
+
+    """
+
+    def test_get_watch_snapshot(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            for path in ["nodes/index",
+                         "nodes/.hidden",
+                         "nodes/foo~",
+                         "templates/default.html",
+                         "static/css/style.css",
+                         "lib/soju.py",
+                         "lib/__pycache__/soju.cpython-312.pyc",
+                         "public/index.html",
+                         "Makefile"]:
+                path = os.path.join(project_root, path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w") as f:
+                    f.write("foo")
+
+            snapshot = uriel.get_watch_snapshot(project_root)
+
+            self.assertEqual(
+                sorted([os.path.join(project_root, "nodes/index"),
+                        os.path.join(project_root, "templates/default.html"),
+                        os.path.join(project_root, "static/css/style.css"),
+                        os.path.join(project_root, "lib/soju.py")]),
+                sorted(snapshot.keys()))
+
+            st = os.stat(os.path.join(project_root, "nodes/index"))
+            self.assertEqual(
+                (st.st_mtime_ns, 3),
+                snapshot[os.path.join(project_root, "nodes/index")])
+
+    def test_get_watch_snapshot_empty_project(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        with TempDir() as project_root:
+            self.assertEqual({}, uriel.get_watch_snapshot(project_root))
+
+
+class TestFunctionGetChangedPaths(unittest.TestCase):
+    """
+    Tests the get_changed_paths() function.
+
+    """
+
+    def test_get_changed_paths(self):
+        c = UrielContainer()
+        uriel = c.uriel
+
+        old_snapshot = {
+            "a": (1, 1),
+            "b": (1, 1),
+            "c": (1, 1),
+            "d": (1, 1),
+        }
+
+        new_snapshot = {
+            "a": (1, 1),
+            "b": (2, 1),
+            "c": (1, 2),
+            "e": (1, 1),
+        }
+
+        self.assertEqual(
+            ["b", "c", "d", "e"],
+            uriel.get_changed_paths(old_snapshot, new_snapshot))
+
+        self.assertEqual(
+            [],
+            uriel.get_changed_paths(old_snapshot, old_snapshot))
+
+
+class TestFunctionWatchProject(unittest.TestCase):
+    """
+    Tests the watch_project() function.
+
+    """
+
+    def test_watch_project_change_during_build(self):
+        c = UrielContainer()
+        uriel = c.uriel
+        uriel.WATCH_INTERVAL = 0.01
+
+        with TempDir() as project_root:
+            os.makedirs(os.path.join(project_root, "nodes"))
+            os.makedirs(os.path.join(project_root, "templates"))
+
+            with open(os.path.join(project_root, "templates/default.html"), "w") as f:
+                f.write("{{node:body}}\n")
+
+            node_file = os.path.join(project_root, "nodes/index")
+            with open(node_file, "w") as f:
+                f.write("Title: Home\n\nbefore\n")
+
+            build_project = uriel.build_project
+            builds = []
+
+            def build_and_edit(project_root, options):
+                build_project(project_root, options)
+                builds.append(True)
+
+                # save a change after the node was read, but before the
+                # build is over
+                if 1 == len(builds):
+                    with open(node_file, "w") as f:
+                        f.write("Title: Home\n\nafter the first build\n")
+
+                # stop watching after the rebuild
+                else:
+                    raise KeyboardInterrupt()
+
+            # don't wait forever if the change is never noticed
+            get_watch_snapshot = uriel.get_watch_snapshot
+            snapshots = []
+
+            def get_limited_watch_snapshot(project_root):
+                snapshots.append(True)
+                if len(snapshots) > 100:
+                    raise KeyboardInterrupt()
+
+                return get_watch_snapshot(project_root)
+
+            uriel.build_project = build_and_edit
+            uriel.get_watch_snapshot = get_limited_watch_snapshot
+
+            try:
+                sys.modules["uriel"] = uriel
+                uriel.watch_project(project_root, uriel.BuildOptions())
+
+            finally:
+                if "uriel" in sys.modules:
+                    del(sys.modules["uriel"])
+
+            self.assertEqual(0, c.exit_code)
+            self.assertEqual(2, len(builds))
+
+            with open(os.path.join(project_root, "public/index.html")) as f:
+                self.assertEqual("after the first build\n", f.read())
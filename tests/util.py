@@ -1,4 +1,5 @@
 import os
+import sys
 import shutil
 import tempfile
 import datetime
@@ -99,6 +100,36 @@ class UrielContainer:
 # FUNCTIONS                                                                  #
 ##############################################################################
 
+def write_file(path, contents):
+    """
+    Write a text file, creating parent directories as needed.
+
+    """
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(contents)
+
+def build(uriel, project_root, options=None):
+    """
+    Build the project with the given uriel module (from a UrielContainer),
+    the same way the uriel script does.
+
+    The uriel module is only in sys.modules while the project is built, so
+    that code under lib/ can import it. The soju and handlers modules are
+    unloaded afterwards, so the next build imports them again.
+
+    """
+
+    try:
+        sys.modules["uriel"] = uriel
+        uriel.handle_project(project_root, options)
+
+    finally:
+        uriel.unload_modules()
+        if "uriel" in sys.modules:
+            del(sys.modules["uriel"])
+
 def get_datetime_from_date_str(date_str):
     """
     Get a datetime.datetime instance from the provided date string.